@@ -1,12 +1,19 @@
 """
 API routes for flashcard operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional
+import itertools
 import logging
+import operator
 
-from app.db import get_db
+import orjson
+
+from app.core.etag import etag_matches, make_etag
+from app.db import SessionLocal, get_db
 from app.schemas import (
     FlashcardCreate,
     FlashcardUpdate,
@@ -14,10 +21,51 @@ from app.schemas import (
     FlashcardList,
 )
 from app.services import FlashcardService
+from app.services.flashcard_service import encode_cursor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Validates a whole page of flashcard rows in a single call
+_flashcard_list_adapter = TypeAdapter(List[FlashcardResponse])
+
+# Rows come straight from the database with the columns of
+# FlashcardResponse, so they are copied into dicts with one attribute
+# getter instead of being validated by pydantic row by row
+_FLASHCARD_FIELDS = tuple(FlashcardResponse.model_fields)
+_get_flashcard_values = operator.attrgetter(*_FLASHCARD_FIELDS)
+
+
+def _flashcard_dicts(rows: Iterable[Any]) -> List[dict]:
+    """
+    Copy flashcard rows into FlashcardResponse-shaped dicts.
+    
+    Args:
+        rows: Rows with the columns of FlashcardResponse
+        
+    Returns:
+        One dict per row
+    """
+    return [dict(zip(_FLASHCARD_FIELDS, _get_flashcard_values(row))) for row in rows]
+
+
+def _dump_flashcard_list(rows: Iterable[Any], **meta: Any) -> bytes:
+    """
+    Serialize a flashcard list page with orjson in one call.
+    
+    Args:
+        rows: Rows with the columns of FlashcardResponse
+        meta: Page metadata such as ``total``
+        
+    Returns:
+        JSON bytes
+    """
+    return orjson.dumps({"flashcards": _flashcard_dicts(rows), **meta})
+
+
+# Rows serialized per chunk by the streaming export
+_EXPORT_BATCH_SIZE = 500
+
 
 @router.post("/", response_model=FlashcardResponse, status_code=201)
 def create_flashcard(
@@ -39,12 +87,47 @@ def create_flashcard(
     """
     try:
         db_flashcard = FlashcardService.create_flashcard(db, flashcard)
-        return FlashcardResponse.from_orm(db_flashcard)
+        return FlashcardResponse.model_validate(db_flashcard)
     except ValueError as e:
-        logger.warning(f"Failed to create flashcard: {e}")
+        logger.warning("Failed to create flashcard: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/bulk", response_model=List[FlashcardResponse], status_code=201)
+def bulk_create_flashcards(
+    flashcards: List[FlashcardCreate] = Body(..., min_length=1, max_length=100),
+    skip_existing: bool = Query(False, description="Skip words the user already has instead of failing"),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Create up to 100 flashcards in one request.
+    
+    Args:
+        flashcards: Flashcard data
+        skip_existing: Whether to skip existing words instead of failing
+        db: Database session
+        
+    Returns:
+        Created flashcards
+        
+    Raises:
+        HTTPException: If a word is duplicated or a user would exceed the limit
+    """
+    try:
+        created = FlashcardService.bulk_create_flashcards(
+            db, flashcards, skip_existing=skip_existing
+        )
+    except ValueError as e:
+        logger.warning("Failed to bulk create flashcards: %s", e)
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return Response(
+        content=_flashcard_list_adapter.dump_json(_flashcard_list_adapter.validate_python(created)),
+        media_type="application/json",
+        status_code=201
+    )
+
+
 @router.get("/stats", response_model=dict)
 def get_user_flashcard_stats(
     user_id: str = Query(..., description="User ID to get statistics for"),
@@ -69,59 +152,151 @@ def get_flashcards(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
     include_hard: bool = Query(True, description="Include hard to remember cards"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's next_cursor"),
     db: Session = Depends(get_db)
-) -> FlashcardList:
+) -> Response:
     """
     Get all flashcards for a specific user with pagination.
     
+    Clients should page with ``cursor`` (keyset pagination); the ``page``
+    parameter is deprecated and kept as an OFFSET-based fallback.
+    
     Args:
         user_id: User ID to filter flashcards
-        page: Page number (1-based)
+        page: Page number (1-based), ignored when a cursor is given
         per_page: Number of items per page
         include_hard: Whether to include hard to remember cards
+        cursor: Opaque cursor returned as next_cursor by the previous page
         db: Database session
         
     Returns:
         Paginated list of flashcards
+        
+    Raises:
+        HTTPException: If the cursor is malformed
     """
-    skip = (page - 1) * per_page
-    
-    flashcards = FlashcardService.get_all_flashcards(
-        db, user_id=user_id, skip=skip, limit=per_page, include_hard=include_hard
-    )
-    total = FlashcardService.count_flashcards(db, user_id=user_id, include_hard=include_hard)
+    if cursor is None:
+        # First page, or the deprecated OFFSET fallback for clients that
+        # still page by number; rows and total come back in one query
+        skip = (page - 1) * per_page
+        flashcards, total = FlashcardService.get_flashcards_page(
+            db, user_id=user_id, skip=skip, limit=per_page, include_hard=include_hard
+        )
+        has_more = skip + len(flashcards) < total
+        next_cursor = None
+        if has_more:
+            last = flashcards[-1]
+            next_cursor = encode_cursor(last.next_review, last.id)
+    else:
+        try:
+            flashcards, next_cursor, has_more = FlashcardService.get_flashcards_after_cursor(
+                db, user_id=user_id, limit=per_page, include_hard=include_hard, cursor=cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        total = FlashcardService.count_flashcards(db, user_id=user_id, include_hard=include_hard)
     
-    return FlashcardList(
-        flashcards=[FlashcardResponse.from_orm(card) for card in flashcards],
+    content = _dump_flashcard_list(
+        flashcards,
         total=total,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        next_cursor=next_cursor,
+        has_more=has_more
     )
+    # Returning a response directly skips FastAPI's second response_model pass
+    return Response(content=content, media_type="application/json")
+
+
+@router.get("/export")
+def export_flashcards(
+    user_id: str = Query(..., description="User ID to export flashcards for"),
+    include_hard: bool = Query(True, description="Include hard to remember cards"),
+    db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """
+    Export every flashcard of a user as a streamed JSON document.
+    
+    The body has the shape ``{"flashcards": [...], "total": n}`` and is
+    written row by row, so memory use does not grow with the collection.
+    
+    The rows are read by a session the stream opens and closes itself:
+    from FastAPI 0.106 on, the ``get_db`` session is closed before a
+    streaming body is sent. Only its bind is reused, so overrides of
+    ``get_db`` still decide which database is read.
+    
+    Args:
+        user_id: User ID to export flashcards for
+        include_hard: Whether to include hard to remember cards
+        db: Database session
+        
+    Returns:
+        Streaming JSON response
+    """
+    bind = db.get_bind()
+    
+    def stream_rows() -> Iterator[bytes]:
+        session = SessionLocal(bind=bind)
+        try:
+            rows = FlashcardService.iter_flashcards(
+                session, user_id=user_id, include_hard=include_hard,
+                batch_size=_EXPORT_BATCH_SIZE
+            )
+            yield b'{"flashcards":['
+            total = 0
+            # Each chunk is encoded by orjson in one call; the list brackets
+            # are stripped so chunks join into a single array
+            while batch := list(itertools.islice(rows, _EXPORT_BATCH_SIZE)):
+                if total:
+                    yield b","
+                yield orjson.dumps(_flashcard_dicts(batch))[1:-1]
+                total += len(batch)
+            yield f'],"total":{total}}}'.encode()
+        finally:
+            session.close()
+    
+    return StreamingResponse(stream_rows(), media_type="application/json")
 
 
 @router.get("/{flashcard_id}", response_model=FlashcardResponse)
 def get_flashcard(
     flashcard_id: str,
+    request: Request,
     db: Session = Depends(get_db)
-) -> FlashcardResponse:
+) -> Response:
     """
     Get a specific flashcard by ID.
     
+    Responses carry a weak ETag; a matching If-None-Match header gets a
+    304 Not Modified without the flashcard being loaded or serialized.
+    
     Args:
         flashcard_id: Flashcard ID
+        request: Incoming request
         db: Database session
         
     Returns:
-        Flashcard data
+        Flashcard data, or an empty 304 response
         
     Raises:
         HTTPException: If flashcard not found
     """
+    if request.headers.get("if-none-match"):
+        updated_at = FlashcardService.get_flashcard_updated_at(db, flashcard_id)
+        if updated_at is not None:
+            etag = make_etag(flashcard_id, updated_at)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+    
     flashcard = FlashcardService.get_flashcard_by_id(db, flashcard_id)
     if not flashcard:
         raise HTTPException(status_code=404, detail="Flashcard not found")
     
-    return FlashcardResponse.from_orm(flashcard)
+    return Response(
+        content=FlashcardResponse.model_validate(flashcard).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": make_etag(flashcard.id, flashcard.updated_at or flashcard.created_at)}
+    )
 
 
 @router.put("/{flashcard_id}", response_model=FlashcardResponse)
@@ -151,9 +326,9 @@ def update_flashcard(
         if not updated_flashcard:
             raise HTTPException(status_code=404, detail="Flashcard not found")
         
-        return FlashcardResponse.from_orm(updated_flashcard)
+        return FlashcardResponse.model_validate(updated_flashcard)
     except ValueError as e:
-        logger.warning(f"Failed to update flashcard {flashcard_id}: {e}")
+        logger.warning("Failed to update flashcard %s: %s", flashcard_id, e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -1,7 +1,8 @@
 """
 API routes for study session operations.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 import logging
 
@@ -10,6 +11,7 @@ from app.schemas import (
     FlashcardResponse,
     ReviewRequest,
     StudyStatusResponse,
+    StudySessionResponse,
 )
 from app.services import StudyService
 
@@ -17,11 +19,29 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _flashcard_response(card: Row) -> Response:
+    """
+    Serialize a flashcard row as a JSON response.
+    
+    Returning a response directly skips FastAPI's second response_model pass.
+    
+    Args:
+        card: Flashcard row
+        
+    Returns:
+        JSON response
+    """
+    return Response(
+        content=FlashcardResponse.model_validate(card).model_dump_json(),
+        media_type="application/json"
+    )
+
+
 @router.get("/next", response_model=FlashcardResponse)
 def get_next_card(
     user_id: str = Query(..., description="User ID to get next card for"),
     db: Session = Depends(get_db)
-) -> FlashcardResponse:
+) -> Response:
     """
     Get the next card for review for a specific user based on spaced repetition algorithm.
     
@@ -42,7 +62,7 @@ def get_next_card(
             detail="No cards available for review"
         )
     
-    return FlashcardResponse.from_orm(card)
+    return _flashcard_response(card)
 
 
 @router.post("/{card_id}/review", response_model=FlashcardResponse)
@@ -50,7 +70,7 @@ def review_card(
     card_id: str,
     review: ReviewRequest,
     db: Session = Depends(get_db)
-) -> FlashcardResponse:
+) -> Response:
     """
     Submit a review for a flashcard.
     
@@ -72,14 +92,14 @@ def review_card(
     if not updated_card:
         raise HTTPException(status_code=404, detail="Card not found")
     
-    return FlashcardResponse.from_orm(updated_card)
+    return _flashcard_response(updated_card)
 
 
 @router.get("/status", response_model=StudyStatusResponse)
 def get_study_status(
     user_id: str = Query(..., description="User ID to get study status for"),
     db: Session = Depends(get_db)
-) -> StudyStatusResponse:
+) -> Response:
     """
     Get current study session status for a specific user.
     
@@ -90,4 +110,32 @@ def get_study_status(
     Returns:
         Comprehensive study status with card counts and availability
     """
-    return StudyService.get_study_status(db, user_id)
+    status = StudyService.get_study_status(db, user_id)
+    # Returning a response directly skips FastAPI's second response_model pass
+    return Response(content=status.model_dump_json(), media_type="application/json")
+
+
+@router.get("/session", response_model=StudySessionResponse)
+def get_study_session(
+    user_id: str = Query(..., description="User ID to get the study session for"),
+    db: Session = Depends(get_db)
+) -> Response:
+    """
+    Get the study status and the next card to review in a single request.
+    
+    Saves the study loop a round trip compared to calling /status and /next
+    separately.
+    
+    Args:
+        user_id: User ID to get the study session for
+        db: Database session
+        
+    Returns:
+        Study status and the next flashcard (null when none is available)
+    """
+    status, card = StudyService.get_study_session(db, user_id)
+    session = StudySessionResponse.model_construct(
+        status=status,
+        next_card=FlashcardResponse.model_validate(card) if card else None,
+    )
+    return Response(content=session.model_dump_json(), media_type="application/json")
@@ -1,10 +1,13 @@
 """
 API routes for user operations.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
+from typing import List
 import logging
 
+from app.core.etag import etag_matches, make_etag
 from app.db import get_db
 from app.schemas import (
     UserCreate,
@@ -17,6 +20,9 @@ from app.services import UserService
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Validates the whole user list in a single call
+_user_list_adapter = TypeAdapter(List[UserResponse])
+
 
 @router.post("/", response_model=UserResponse, status_code=201)
 def create_user(
@@ -38,16 +44,16 @@ def create_user(
     """
     try:
         db_user = UserService.create_user(db, user)
-        return UserResponse.from_orm(db_user)
+        return UserResponse.model_validate(db_user)
     except ValueError as e:
-        logger.warning(f"Failed to create user: {e}")
+        logger.warning("Failed to create user: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/", response_model=UserList)
 def get_users(
     db: Session = Depends(get_db)
-) -> UserList:
+) -> Response:
     """
     Get all users.
     
@@ -60,35 +66,53 @@ def get_users(
     users = UserService.get_all_users(db)
     total = UserService.count_users(db)
     
-    return UserList(
-        users=[UserResponse.from_orm(user) for user in users],
+    payload = UserList(
+        users=_user_list_adapter.validate_python(users),
         total=total
     )
+    # Returning a response directly skips FastAPI's second response_model pass
+    return Response(content=payload.model_dump_json(), media_type="application/json")
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(
     user_id: str,
+    request: Request,
     db: Session = Depends(get_db)
-) -> UserResponse:
+) -> Response:
     """
     Get a specific user by ID.
     
+    Responses carry a weak ETag; a matching If-None-Match header gets a
+    304 Not Modified without the user being loaded or serialized.
+    
     Args:
         user_id: User ID
+        request: Incoming request
         db: Database session
         
     Returns:
-        User data
+        User data, or an empty 304 response
         
     Raises:
         HTTPException: If user not found
     """
+    if request.headers.get("if-none-match"):
+        updated_at = UserService.get_user_updated_at(db, user_id)
+        if updated_at is not None:
+            etag = make_etag(user_id, updated_at)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+    
     user = UserService.get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return UserResponse.from_orm(user)
+    return Response(
+        content=UserResponse.model_validate(user).model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": make_etag(user.id, user.updated_at or user.created_at)}
+    )
 
 
 @router.put("/{user_id}", response_model=UserResponse)
@@ -116,9 +140,9 @@ def update_user(
         if not updated_user:
             raise HTTPException(status_code=404, detail="User not found")
         
-        return UserResponse.from_orm(updated_user)
+        return UserResponse.model_validate(updated_user)
     except ValueError as e:
-        logger.warning(f"Failed to update user {user_id}: {e}")
+        logger.warning("Failed to update user %s: %s", user_id, e)
         raise HTTPException(status_code=400, detail=str(e))
 
 
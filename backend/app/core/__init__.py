@@ -1,6 +1,6 @@
 """Core module exports."""
 
-from .config import settings
+from .config import get_settings, settings
 from .exceptions import (
     http_exception_handler,
     sqlalchemy_exception_handler,
@@ -10,6 +10,7 @@ from .security import get_current_user, validate_permissions
 
 __all__ = [
     "settings",
+    "get_settings",
     "http_exception_handler",
     "sqlalchemy_exception_handler", 
     "general_exception_handler",
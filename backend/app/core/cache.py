@@ -0,0 +1,120 @@
+"""
+In-process caching helpers.
+"""
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache whose entries expire after a fixed TTL.
+
+    A value computed from the database can be invalidated by a write that
+    commits while it is being computed. Take a ``token()`` before reading
+    and pass it to ``set()``: the value is then dropped instead of stored if
+    its key was deleted (or the cache cleared) in the meantime.
+    """
+
+    def __init__(self, ttl: float):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid after it is set
+        """
+        self.ttl = ttl
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # Invalidation counter, and its value at each key's last delete and
+        # at the last clear
+        self._version = 0
+        self._deleted_at: Dict[Hashable, int] = {}
+        self._cleared_at = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def token(self) -> int:
+        """
+        Mark the start of computing a value to cache.
+
+        Returns:
+            Token to pass to ``set()``
+        """
+        with self._lock:
+            return self._version
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        token: Optional[int] = None
+    ) -> None:
+        """
+        Store a value for the configured TTL.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Seconds this entry stays valid, overriding the cache's TTL
+            token: Result of ``token()`` taken before the value was computed;
+                the value is not stored if the key was invalidated since
+        """
+        if ttl is None:
+            ttl = self.ttl
+        with self._lock:
+            if token is not None and (
+                self._deleted_at.get(key, 0) > token or self._cleared_at > token
+            ):
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, *keys: Hashable) -> None:
+        """
+        Invalidate one or more keys.
+
+        Args:
+            keys: Cache keys to remove
+        """
+        with self._lock:
+            self._version += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self._deleted_at[key] = self._version
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+            self._deleted_at.clear()
+            self._cleared_at = self._version
+
+
+# Per-user flashcard counts backing the /flashcards/stats endpoint
+flashcard_count_cache = TTLCache(ttl=settings.STATS_CACHE_TTL)
+
+# Per-user study status, so status polling does not recount every few seconds
+study_status_cache = TTLCache(ttl=settings.STUDY_STATUS_CACHE_TTL)
+
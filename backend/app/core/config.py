@@ -2,9 +2,10 @@
 Core configuration settings for the application.
 """
 import os
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Optional
 
-from pydantic import PostgresDsn, field_validator
+from pydantic import PostgresDsn, PrivateAttr, field_validator, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -21,14 +22,28 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = False
+    LOG_LEVEL: str = "WARNING"
     
-    # Database Config
-    DATABASE_URL: Optional[PostgresDsn] = None
+    # Database Config. DATABASE_URL comes after the DB_* fields so its
+    # validator can assemble it from them when it is not set directly.
     DB_HOST: str = "localhost"
     DB_PORT: int = 5432
     DB_USER: str = "flashcard_user"
     DB_PASSWORD: str = "flashcard_password"
     DB_NAME: str = "flashcards"
+    DATABASE_URL: Optional[PostgresDsn] = None
+    
+    # Connection pool sizing (per worker process)
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 5      # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 300    # seconds before a connection is replaced
+    # Server-side cap on any single statement (milliseconds, 0 disables)
+    DB_STATEMENT_TIMEOUT_MS: int = 2000
+    
+    # Run CREATE TABLE IF NOT EXISTS on startup. Disable once the schema is
+    # provisioned out of band (scripts/setup_db.sh) to keep cold starts lean.
+    CREATE_TABLES_ON_STARTUP: bool = True
     
     @field_validator("DATABASE_URL", mode="before")
     @classmethod
@@ -37,8 +52,8 @@ class Settings(BaseSettings):
         if isinstance(v, str):
             return v
         
-        # Get values from the validation context
-        values = info.data if hasattr(info, 'data') else {}
+        # Fields declared above DATABASE_URL are already validated
+        values = info.data
         
         return PostgresDsn.build(
             scheme="postgresql",
@@ -49,6 +64,19 @@ class Settings(BaseSettings):
             path=values.get("DB_NAME", "flashcards"),
         )
     
+    _sqlalchemy_url: str = PrivateAttr("")
+    
+    @model_validator(mode="after")
+    def cache_sqlalchemy_url(self) -> "Settings":
+        """Render the database URL to a string once, after validation."""
+        self._sqlalchemy_url = str(self.DATABASE_URL)
+        return self
+    
+    @property
+    def sqlalchemy_url(self) -> str:
+        """Database URL as a plain string for SQLAlchemy."""
+        return self._sqlalchemy_url
+    
     # CORS Config
     ALLOWED_ORIGINS: list[str] = [
         "http://localhost:3000",
@@ -59,19 +87,25 @@ class Settings(BaseSettings):
     # Spaced Repetition Config
     MAX_INCORRECT_COUNT: int = 10
     MAX_FLASHCARDS_PER_USER: int = 1000
-    BIN_TIMESPANS: dict[int, int] = {
-        1: 5,           # 5 seconds
-        2: 25,          # 25 seconds  
-        3: 120,         # 2 minutes
-        4: 600,         # 10 minutes
-        5: 3600,        # 1 hour
-        6: 18000,       # 5 hours
-        7: 86400,       # 1 day
-        8: 432000,      # 5 days
-        9: 2160000,     # 25 days
-        10: 10368000,   # 4 months (120 days)
-        11: 999999999   # effectively never (31+ years)
-    }
+    STATS_CACHE_TTL: int = 60  # seconds a user's cached flashcard count stays valid
+    STUDY_STATUS_CACHE_TTL: int = 5  # seconds a user's cached study status stays valid
+    # Review delay in seconds, indexed by bin number. A class-level tuple
+    # rather than a settings field: it is not env-configurable and indexing
+    # it on every review is cheaper than a dict lookup.
+    BIN_TIMESPANS: ClassVar[tuple[int, ...]] = (
+        0,              # 0: new cards, available immediately
+        5,              # 1: 5 seconds
+        25,             # 2: 25 seconds
+        120,            # 3: 2 minutes
+        600,            # 4: 10 minutes
+        3600,           # 5: 1 hour
+        18000,          # 6: 5 hours
+        86400,          # 7: 1 day
+        432000,         # 8: 5 days
+        2160000,        # 9: 25 days
+        10368000,       # 10: 4 months (120 days)
+        999999999,      # 11: effectively never (31+ years)
+    )
     
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-this-in-production"
@@ -83,5 +117,19 @@ class Settings(BaseSettings):
     }
 
 
+@lru_cache()
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading the environment only once.
+    
+    Usable as a FastAPI dependency; tests can override it through
+    ``app.dependency_overrides`` or call ``get_settings.cache_clear()``.
+    
+    Returns:
+        Shared settings instance
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,39 @@
+"""
+HTTP ETag helpers for conditional GET requests.
+"""
+from datetime import datetime
+
+from fastapi import Request
+
+
+def make_etag(resource_id: str, updated_at: datetime) -> str:
+    """
+    Build a weak ETag from a resource's ID and last modification time.
+
+    Args:
+        resource_id: Resource ID
+        updated_at: When the resource was last modified
+
+    Returns:
+        Weak ETag header value
+    """
+    return f'W/"{resource_id}-{updated_at.strftime("%Y%m%d%H%M%S%f")}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether a request's If-None-Match header matches an ETag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's cached copy is still current
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    candidates = {tag.strip() for tag in header.split(",")}
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
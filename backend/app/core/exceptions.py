@@ -25,7 +25,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 
 async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     """Handle SQLAlchemy database errors."""
-    logger.error(f"Database error: {exc}")
+    logger.error("Database error: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
@@ -40,7 +40,7 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
-    logger.error(f"Unexpected error: {exc}", exc_info=True)
+    logger.error("Unexpected error: %s", exc, exc_info=True)
     return JSONResponse(
         status_code=500,
         content={
@@ -1,25 +1,25 @@
 """
 Security utilities and authentication dependencies.
 """
-from typing import Optional
-from fastapi import HTTPException, Security, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import HTTPException, Depends
+from fastapi.security import HTTPBearer
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Security scheme for potential future authentication
+# Security scheme for potential future authentication. It is deliberately
+# not injected into get_current_user while authentication is disabled, so
+# requests don't pay for parsing the Authorization header.
 security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security)
-):
+async def get_current_user() -> None:
     """
     Get current user from token (placeholder for future authentication).
     
     Currently returns None as authentication is not implemented.
-    This is here for future extensibility.
+    When authentication lands, take ``credentials = Security(security)``
+    here again.
     """
     # For now, no authentication is required
     # In the future, this could validate JWT tokens, API keys, etc.
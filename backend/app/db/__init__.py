@@ -1,5 +1,19 @@
 """Database package exports."""
 
-from .database import engine, SessionLocal, create_tables, get_db
+from .database import (
+    engine,
+    SessionLocal,
+    check_connection,
+    create_tables,
+    get_db,
+    get_pool_status,
+)
 
-__all__ = ["engine", "SessionLocal", "create_tables", "get_db"]
+__all__ = [
+    "engine",
+    "SessionLocal",
+    "check_connection",
+    "create_tables",
+    "get_db",
+    "get_pool_status",
+]
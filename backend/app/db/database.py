@@ -1,21 +1,33 @@
 """
 Database configuration and session management.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Dict, Generator
 import logging
 
-from app.core.config import settings
+from app.core.config import get_settings
 from app.models import Base
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+connect_args = {}
+if settings.DB_STATEMENT_TIMEOUT_MS:
+    # A runaway query fails fast instead of pinning a pooled connection
+    connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+
 # Create database engine
 engine = create_engine(
-    str(settings.DATABASE_URL),
+    settings.sqlalchemy_url,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
     pool_pre_ping=True,  # Verify connections before use
-    pool_recycle=300,    # Recycle connections every 5 minutes
+    pool_use_lifo=True,  # Reuse the most recent connection so idle ones can be recycled
+    connect_args=connect_args,
     echo=settings.DEBUG, # Log SQL queries in debug mode
 )
 
@@ -29,10 +41,32 @@ def create_tables() -> None:
         Base.metadata.create_all(bind=engine)
         logger.info("✅ Database tables created successfully")
     except Exception as e:
-        logger.error(f"⚠️ Database table creation failed: {e}")
+        logger.error("⚠️ Database table creation failed: %s", e)
         raise
 
 
+def check_connection() -> None:
+    """Open a pooled connection and run a trivial query to verify connectivity."""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def get_pool_status() -> Dict[str, int]:
+    """
+    Report connection pool usage.
+    
+    Returns:
+        Dictionary with pool size and checked-in/checked-out/overflow counts
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency that provides a database session.
@@ -47,7 +81,7 @@ def get_db() -> Generator[Session, None, None]:
     try:
         yield db
     except Exception as e:
-        logger.error(f"Database session error: {e}")
+        logger.error("Database session error: %s", e)
         db.rollback()
         raise
     finally:
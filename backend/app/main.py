@@ -1,22 +1,47 @@
 """
 Main FastAPI application factory and configuration.
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+from fastapi.responses import HTMLResponse, ORJSONResponse
 import logging
 
-from app.core.config import settings
-from app.db import create_tables
+import orjson
+
+from app.core.config import get_settings
+from app.db import check_connection, create_tables, engine, get_pool_status
 from app.api import api_router
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=get_settings().LOG_LEVEL.upper(),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm the connection pool on startup and release it on shutdown."""
+    try:
+        if get_settings().CREATE_TABLES_ON_STARTUP:
+            create_tables()
+        else:
+            check_connection()
+        logger.info("✅ Database initialization completed")
+    except Exception as e:
+        logger.error("⚠️ Database initialization failed: %s", e)
+        logger.error("📝 Please ensure PostgreSQL is running and properly configured")
+    
+    yield
+    
+    engine.dispose()
+
+
 def create_app() -> FastAPI:
     """
     Create and configure FastAPI application.
@@ -24,15 +49,25 @@ def create_app() -> FastAPI:
     Returns:
         Configured FastAPI app instance
     """
-    # Create FastAPI app
+    settings = get_settings()
+    openapi_url = f"{settings.API_V1_STR}/openapi.json"
+    
+    # Create FastAPI app. The schema and docs routes are registered below so
+    # the OpenAPI document can be served from cached bytes.
     app = FastAPI(
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
         description=settings.DESCRIPTION,
-        openapi_url=f"{settings.API_V1_STR}/openapi.json",
-        docs_url="/docs",
-        redoc_url="/redoc"
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
+    app.state.openapi_bytes = None
+    
+    # Compress larger responses such as full flashcard pages
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
     
     # Configure CORS
     app.add_middleware(
@@ -46,20 +81,11 @@ def create_app() -> FastAPI:
     # Include API routes
     app.include_router(api_router, prefix=settings.API_V1_STR)
     
-    # Add startup event
-    @app.on_event("startup")
-    async def startup_event():
-        """Initialize database tables on startup."""
-        try:
-            create_tables()
-            logger.info("✅ Database initialization completed")
-        except Exception as e:
-            logger.error(f"⚠️ Database initialization failed: {e}")
-            logger.error("📝 Please ensure PostgreSQL is running and properly configured")
-    
     # Add health check endpoints
+    # These endpoints never touch the database, so they run directly on the
+    # event loop instead of being dispatched to the threadpool.
     @app.get("/")
-    def root():
+    async def root():
         """Root endpoint."""
         return {
             "message": f"{settings.PROJECT_NAME} is running",
@@ -68,9 +94,32 @@ def create_app() -> FastAPI:
         }
     
     @app.get("/health")
-    def health_check():
+    async def health_check():
         """Health check endpoint for Cloud Run."""
-        return {"status": "healthy", "service": "flashcard-backend"}
+        return {
+            "status": "healthy",
+            "service": "flashcard-backend",
+            "db_pool": get_pool_status()
+        }
+    
+    # OpenAPI schema and docs. The schema is built and serialized on first
+    # request, then every later request gets the same bytes.
+    @app.get(openapi_url, include_in_schema=False)
+    async def openapi_json() -> Response:
+        """Serve the cached OpenAPI schema."""
+        if app.state.openapi_bytes is None:
+            app.state.openapi_bytes = orjson.dumps(app.openapi())
+        return Response(content=app.state.openapi_bytes, media_type="application/json")
+    
+    @app.get("/docs", include_in_schema=False)
+    async def swagger_ui() -> HTMLResponse:
+        """Swagger UI documentation."""
+        return get_swagger_ui_html(openapi_url=openapi_url, title=f"{app.title} - Swagger UI")
+    
+    @app.get("/redoc", include_in_schema=False)
+    async def redoc() -> HTMLResponse:
+        """ReDoc documentation."""
+        return get_redoc_html(openapi_url=openapi_url, title=f"{app.title} - ReDoc")
     
     return app
 
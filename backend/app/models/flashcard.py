@@ -3,39 +3,61 @@ Database models for flashcard application.
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey
-from sqlalchemy.orm import declarative_base, relationship
+from typing import TYPE_CHECKING, Optional
+from sqlalchemy import Integer, String, DateTime, Boolean, Text, ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
-Base = declarative_base()
+from app.models.types import UUIDString
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class Base(DeclarativeBase):
+    """Declarative base shared by all models."""
 
 
 class Flashcard(Base):
     """Flashcard model for storing vocabulary words and their progress."""
     
     __tablename__ = "flashcards"
+    __table_args__ = (
+        # Matches the keyset pagination order used by the flashcard list endpoint
+        Index("ix_fc_user_next_review", "user_id", "next_review", "id"),
+        # Covers the hard-card filter together with the review order
+        Index("ix_fc_user_review", "user_id", "is_hard_to_remember", "next_review", "id"),
+        # Also serves duplicate-word lookups for a user
+        UniqueConstraint("user_id", "word", name="uq_fc_user_word"),
+        # The primary key is a UUID string, so SQLite stores the table as a
+        # clustered index on it instead of a separate rowid B-tree
+        {"sqlite_with_rowid": False},
+    )
+    # Fetch server-generated values with RETURNING as part of the INSERT or
+    # UPDATE, so batched flushes use insertmanyvalues without follow-up SELECTs
+    __mapper_args__ = {"eager_defaults": True}
     
     # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # Foreign key to user
-    user_id = Column(String, ForeignKey('users.id'), nullable=False, index=True)
+    user_id: Mapped[str] = mapped_column(UUIDString, ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     
     # Core content
-    word = Column(String(255), nullable=False, index=True)
-    definition = Column(Text, nullable=False)
+    word: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    definition: Mapped[str] = mapped_column(Text, nullable=False)
     
     # Spaced repetition fields
-    bin_number = Column(Integer, default=0, nullable=False, index=True)
-    incorrect_count = Column(Integer, default=0, nullable=False)
-    next_review = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    bin_number: Mapped[int] = mapped_column(Integer, default=0, nullable=False, index=True)
+    incorrect_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_review: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    is_hard_to_remember = Column(Boolean, default=False, nullable=False, index=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    is_hard_to_remember: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     
     # Relationship to user
-    user = relationship("User", back_populates="flashcards")
+    user: Mapped["User"] = relationship(back_populates="flashcards")
     
     def __repr__(self) -> str:
         """String representation of flashcard."""
@@ -44,3 +66,26 @@ class Flashcard(Base):
     def __str__(self) -> str:
         """Human-readable string representation."""
         return f"{self.word}: {self.definition[:50]}..."
+
+
+# Study queue indexes. They use a descending bin_number, so they are declared
+# against the mapped columns once the class exists.
+Index(
+    "ix_fc_user_active_bin_review",
+    Flashcard.user_id,
+    Flashcard.is_hard_to_remember,
+    Flashcard.bin_number.desc(),
+    Flashcard.next_review,
+)
+# Only cards that can be due for review. PostgreSQL uses a partial index only
+# if it can prove the query implies the predicate, so the predicate repeats
+# the study queries' filter term for term (a BETWEEN 1 AND 10 range is never
+# matched). SQLite receives the bin bounds as bound parameters and cannot use
+# it at all, so the index is only created on PostgreSQL.
+Index(
+    "ix_fc_ready",
+    Flashcard.user_id,
+    Flashcard.bin_number.desc(),
+    Flashcard.next_review,
+    postgresql_where=text("is_hard_to_remember = false AND bin_number >= 1 AND bin_number < 11"),
+).ddl_if(dialect="postgresql")
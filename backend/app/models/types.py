@@ -0,0 +1,41 @@
+"""
+Custom column types shared by the models.
+"""
+import uuid
+
+from sqlalchemy import String
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.types import TypeDecorator
+
+
+class UUIDString(TypeDecorator):
+    """
+    UUID primary/foreign key exposed to Python as a string.
+    
+    Stored as the native 16-byte ``uuid`` type on PostgreSQL and as
+    ``VARCHAR`` elsewhere (e.g. SQLite in tests).
+    """
+    
+    impl = String
+    cache_ok = True
+    
+    def load_dialect_impl(self, dialect):
+        """Use the native UUID type on PostgreSQL."""
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(String())
+    
+    def process_bind_param(self, value, dialect):
+        """
+        Normalize bound IDs for PostgreSQL.
+        
+        A value that is not a valid UUID can never match a stored ID, so it
+        is bound as NULL instead of failing the whole statement with a cast
+        error; lookups by a malformed ID then simply find nothing.
+        """
+        if value is None or dialect.name != "postgresql":
+            return value
+        try:
+            return str(uuid.UUID(str(value)))
+        except ValueError:
+            return None
@@ -3,30 +3,39 @@ Database models for user management.
 """
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, Integer
-from sqlalchemy.orm import relationship
+from typing import TYPE_CHECKING, List, Optional
+from sqlalchemy import String, DateTime
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 # Import Base from flashcard module to avoid circular imports
 from app.models.flashcard import Base
+from app.models.types import UUIDString
+
+if TYPE_CHECKING:
+    from app.models.flashcard import Flashcard
 
 
 class User(Base):
     """User model for managing flashcard users."""
     
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
     # Primary key
-    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=lambda: str(uuid.uuid4()))
     
     # User details
-    name = Column(String(100), nullable=False, unique=True, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, index=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    # Relationship to flashcards
-    flashcards = relationship("Flashcard", back_populates="user", cascade="all, delete-orphan")
+    # Relationship to flashcards. The database deletes them via ON DELETE
+    # CASCADE, so deleting a user never loads its flashcards.
+    flashcards: Mapped[List["Flashcard"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
     
     def __repr__(self) -> str:
         """String representation of user."""
@@ -10,6 +10,7 @@ from .flashcard import (
 from .study import (
     ReviewRequest,
     StudyStatusResponse,
+    StudySessionResponse,
     StudySessionStats,
 )
 from .user import (
@@ -30,6 +31,7 @@ __all__ = [
     # Study schemas
     "ReviewRequest",
     "StudyStatusResponse", 
+    "StudySessionResponse",
     "StudySessionStats",
     # User schemas
     "UserBase",
@@ -2,29 +2,19 @@
 Pydantic schemas for flashcard operations.
 """
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class FlashcardBase(BaseModel):
     """Base schema for flashcard data."""
+    # Strings are stripped before length checks, so whitespace-only values
+    # fail min_length without a Python-level validator.
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    
     word: str = Field(..., min_length=1, max_length=255, description="The word to learn")
     definition: str = Field(..., min_length=1, max_length=2000, description="Definition of the word")
     user_id: str = Field(..., description="ID of the user who owns this flashcard")
-    
-    @validator('word')
-    def word_must_not_be_empty(cls, v):
-        """Ensure word is not just whitespace."""
-        if not v.strip():
-            raise ValueError('Word cannot be empty or just whitespace')
-        return v.strip()
-    
-    @validator('definition')
-    def definition_must_not_be_empty(cls, v):
-        """Ensure definition is not just whitespace."""
-        if not v.strip():
-            raise ValueError('Definition cannot be empty or just whitespace')
-        return v.strip()
 
 
 class FlashcardCreate(FlashcardBase):
@@ -34,23 +24,11 @@ class FlashcardCreate(FlashcardBase):
 
 class FlashcardUpdate(BaseModel):
     """Schema for updating an existing flashcard."""
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+    
     word: Optional[str] = Field(None, min_length=1, max_length=255)
     definition: Optional[str] = Field(None, min_length=1, max_length=2000)
     user_id: Optional[str] = Field(None, description="ID of the user who owns this flashcard")
-    
-    @validator('word')
-    def word_must_not_be_empty(cls, v):
-        """Ensure word is not just whitespace if provided."""
-        if v is not None and not v.strip():
-            raise ValueError('Word cannot be empty or just whitespace')
-        return v.strip() if v else v
-    
-    @validator('definition')
-    def definition_must_not_be_empty(cls, v):
-        """Ensure definition is not just whitespace if provided."""
-        if v is not None and not v.strip():
-            raise ValueError('Definition cannot be empty or just whitespace')
-        return v.strip() if v else v
 
 
 class FlashcardResponse(FlashcardBase):
@@ -63,8 +41,7 @@ class FlashcardResponse(FlashcardBase):
     updated_at: Optional[datetime] = Field(None, description="When the card was last updated")
     is_hard_to_remember: bool = Field(False, description="Whether this card is marked as hard to remember")
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class FlashcardList(BaseModel):
@@ -73,6 +50,8 @@ class FlashcardList(BaseModel):
     total: int = Field(..., ge=0, description="Total number of flashcards")
     page: int = Field(..., ge=1, description="Current page number")
     per_page: int = Field(..., ge=1, le=100, description="Items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for fetching the next page")
+    has_more: bool = Field(False, description="Whether more flashcards exist after this page")
     
     @property
     def total_pages(self) -> int:
@@ -1,12 +1,16 @@
 """
 Pydantic schemas for study session operations.
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
+from .flashcard import FlashcardResponse
+
 
 class ReviewRequest(BaseModel):
     """Schema for submitting a card review."""
+    model_config = ConfigDict(extra="forbid")
+    
     correct: bool = Field(..., description="Whether the user answered correctly")
 
 
@@ -21,6 +25,12 @@ class StudyStatusResponse(BaseModel):
     hard_cards: int = Field(..., ge=0, description="Number of hard to remember cards")
 
 
+class StudySessionResponse(BaseModel):
+    """Schema for the study status together with the next card to review."""
+    status: StudyStatusResponse = Field(..., description="Current study status")
+    next_card: Optional[FlashcardResponse] = Field(None, description="Next card to review, if any")
+
+
 class StudySessionStats(BaseModel):
     """Schema for study session statistics."""
     cards_reviewed: int = Field(..., ge=0, description="Number of cards reviewed in this session")
@@ -30,8 +40,9 @@ class StudySessionStats(BaseModel):
     
     @property
     def accuracy_percentage(self) -> float:
-        """Calculate accuracy percentage."""
+        """Calculate accuracy percentage, rounded half up to two decimals."""
         total = self.correct_answers + self.incorrect_answers
         if total == 0:
             return 0.0
-        return round((self.correct_answers / total) * 100, 2)
+        # Scaled integer math: hundredths of a percent, rounded half up
+        return (self.correct_answers * 20000 + total) // (2 * total) / 100
@@ -2,20 +2,17 @@
 Pydantic schemas for user operations.
 """
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional
+
+# Names are stripped before the length checks, so whitespace-only values are
+# rejected by pydantic-core without a Python-level validator.
+UserName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=100)]
 
 
 class UserBase(BaseModel):
     """Base schema for user data."""
-    name: str = Field(..., min_length=1, max_length=100, description="The user's name")
-    
-    @validator('name')
-    def name_must_not_be_empty(cls, v):
-        """Ensure name is not just whitespace."""
-        if not v.strip():
-            raise ValueError('Name cannot be empty or just whitespace')
-        return v.strip()
+    name: UserName = Field(..., description="The user's name")
 
 
 class UserCreate(UserBase):
@@ -25,24 +22,16 @@ class UserCreate(UserBase):
 
 class UserUpdate(BaseModel):
     """Schema for updating an existing user."""
-    name: Optional[str] = Field(None, min_length=1, max_length=100)
-    
-    @validator('name')
-    def name_must_not_be_empty(cls, v):
-        """Ensure name is not just whitespace if provided."""
-        if v is not None and not v.strip():
-            raise ValueError('Name cannot be empty or just whitespace')
-        return v.strip() if v else v
+    name: Optional[UserName] = None
 
 
 class UserResponse(UserBase):
     """Schema for user responses."""
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str = Field(..., description="Unique identifier for the user")
     created_at: datetime = Field(..., description="When the user was created")
     updated_at: Optional[datetime] = Field(None, description="When the user was last updated")
-    
-    class Config:
-        from_attributes = True
 
 
 class UserList(BaseModel):
@@ -1,71 +1,261 @@
 """
 Business logic for flashcard operations.
 """
+import base64
+import binascii
+import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import Row, delete, func, insert, literal, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.exc import IntegrityError
 import logging
 
-from app.models import Flashcard
+from app.models import Flashcard, User
 from app.schemas import FlashcardCreate, FlashcardUpdate
+from app.core.cache import flashcard_count_cache, study_status_cache
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Columns needed to render a FlashcardResponse. Read and write queries
+# project or return only these instead of loading full ORM entities.
+RESPONSE_COLUMNS = (
+    Flashcard.id,
+    Flashcard.word,
+    Flashcard.definition,
+    Flashcard.user_id,
+    Flashcard.bin_number,
+    Flashcard.incorrect_count,
+    Flashcard.next_review,
+    Flashcard.created_at,
+    Flashcard.updated_at,
+    Flashcard.is_hard_to_remember,
+)
+
+
+def encode_cursor(next_review: datetime, flashcard_id: str) -> str:
+    """
+    Encode a keyset pagination position as an opaque cursor string.
+    
+    Args:
+        next_review: Review time of the last flashcard on the page
+        flashcard_id: ID of the last flashcard on the page
+        
+    Returns:
+        URL-safe base64 cursor
+    """
+    raw = f"{next_review.isoformat()}|{flashcard_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+    
+    Args:
+        cursor: Opaque cursor string
+        
+    Returns:
+        Tuple of (next_review, flashcard_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        next_review_iso, flashcard_id = raw.split("|", 1)
+        return datetime.fromisoformat(next_review_iso), flashcard_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def _dialect_insert(db: Session):
+    """Return the dialect-specific ``insert`` (with ON CONFLICT support) for a session."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert
+    return sqlite.insert
+
+
+def _lock_users(db: Session, user_ids: List[str]) -> None:
+    """
+    Lock user rows until the end of the transaction.
+    
+    Serializes flashcard inserts per user, so each one's limit check sees
+    the others' rows. Locks are taken in ID order to avoid deadlocks between
+    batches; on SQLite, which has no row locks, this is a plain SELECT.
+    
+    Args:
+        db: Database session
+        user_ids: IDs of the users whose flashcards are about to be inserted
+    """
+    db.execute(
+        select(User.id)
+        .where(User.id.in_(user_ids))
+        .order_by(User.id)
+        .with_for_update()
+    ).all()
+
 
 class FlashcardService:
     """Service class for flashcard business logic."""
     
     @staticmethod
-    def create_flashcard(db: Session, flashcard_data: FlashcardCreate) -> Flashcard:
+    def create_flashcard(db: Session, flashcard_data: FlashcardCreate) -> Row:
         """
         Create a new flashcard.
         
+        The per-user limit is enforced inside a single
+        ``INSERT ... SELECT ... WHERE (count) < limit RETURNING`` statement and
+        duplicate words by the ``uq_fc_user_word`` constraint. Concurrent
+        inserts for the same user would all see the same count under READ
+        COMMITTED, so the user row is locked first to serialize them.
+        
         Args:
             db: Database session
             flashcard_data: Flashcard creation data
             
         Returns:
-            Created flashcard
+            Row of the created flashcard
             
         Raises:
             ValueError: If word already exists for this user or user has reached flashcard limit
         """
-        # Check if user has reached the flashcard limit
-        user_flashcard_count = db.query(Flashcard).filter(
-            Flashcard.user_id == flashcard_data.user_id
-        ).count()
-        if user_flashcard_count >= settings.MAX_FLASHCARDS_PER_USER:
-            raise ValueError(f"You have reached the maximum limit of {settings.MAX_FLASHCARDS_PER_USER} flashcards per user")
-        
-        # Check if word already exists for this user
-        existing = db.query(Flashcard).filter(
-            Flashcard.word == flashcard_data.word,
-            Flashcard.user_id == flashcard_data.user_id
-        ).first()
-        if existing:
-            raise ValueError(f"A flashcard with the word '{flashcard_data.word}' already exists for this user")
+        now = datetime.utcnow()
+        user_card_count = (
+            select(func.count())
+            .select_from(Flashcard)
+            .where(Flashcard.user_id == flashcard_data.user_id)
+            .scalar_subquery()
+        )
+        values = select(
+            literal(str(uuid.uuid4()), Flashcard.id.type),
+            literal(flashcard_data.word),
+            literal(flashcard_data.definition),
+            literal(flashcard_data.user_id, Flashcard.user_id.type),
+            literal(0),
+            literal(0),
+            literal(now),
+            literal(now),
+            literal(now),
+            literal(False),
+        ).where(user_card_count < settings.MAX_FLASHCARDS_PER_USER)
+        stmt = insert(Flashcard).from_select(
+            [
+                Flashcard.id,
+                Flashcard.word,
+                Flashcard.definition,
+                Flashcard.user_id,
+                Flashcard.bin_number,
+                Flashcard.incorrect_count,
+                Flashcard.next_review,
+                Flashcard.created_at,
+                Flashcard.updated_at,
+                Flashcard.is_hard_to_remember,
+            ],
+            values
+        ).returning(*RESPONSE_COLUMNS)
         
         try:
-            db_flashcard = Flashcard(
-                word=flashcard_data.word,
-                definition=flashcard_data.definition,
-                user_id=flashcard_data.user_id,
-                bin_number=0,
-                incorrect_count=0,
-                next_review=datetime.utcnow()
-            )
-            db.add(db_flashcard)
+            _lock_users(db, [flashcard_data.user_id])
+            created = db.execute(stmt).first()
             db.commit()
-            db.refresh(db_flashcard)
+        except IntegrityError:
+            db.rollback()
+            raise ValueError(f"A flashcard with the word '{flashcard_data.word}' already exists for this user")
+        
+        if created is None:
+            raise ValueError(f"You have reached the maximum limit of {settings.MAX_FLASHCARDS_PER_USER} flashcards per user")
+        
+        flashcard_count_cache.delete(flashcard_data.user_id)
+        study_status_cache.delete(flashcard_data.user_id)
+        logger.info("Created flashcard: %s for user %s", flashcard_data.word, flashcard_data.user_id)
+        return created
+    
+    @staticmethod
+    def bulk_create_flashcards(
+        db: Session,
+        flashcards_data: List[FlashcardCreate],
+        skip_existing: bool = False
+    ) -> List[Row]:
+        """
+        Create several flashcards with a single multi-row INSERT ... RETURNING.
+        
+        The per-user limit is verified with one aggregated query inside the
+        same transaction, after locking the affected user rows so concurrent
+        batches cannot both pass it, and the batch is committed at once:
+        either every flashcard is created or none is.
+        
+        Args:
+            db: Database session
+            flashcards_data: Flashcard creation data
+            skip_existing: Skip words the user already has (ON CONFLICT DO
+                NOTHING) instead of rejecting the batch
             
-            logger.info(f"Created flashcard: {flashcard_data.word} for user {flashcard_data.user_id}")
-            return db_flashcard
+        Returns:
+            Rows of the created flashcards. Rows rather than ORM objects, so
+            reading them after the commit needs no refresh. Input order is
+            kept unless ``skip_existing`` is set
             
+        Raises:
+            ValueError: If a word is repeated or already exists for its user,
+                or a user would exceed the flashcard limit
+        """
+        if not flashcards_data:
+            return []
+        
+        now = datetime.utcnow()
+        rows = []
+        seen = set()
+        for item in flashcards_data:
+            key = (item.user_id, item.word)
+            if key in seen:
+                if skip_existing:
+                    continue
+                raise ValueError(f"The word '{item.word}' appears more than once for the same user")
+            seen.add(key)
+            rows.append({
+                "id": str(uuid.uuid4()),
+                "word": item.word,
+                "definition": item.definition,
+                "user_id": item.user_id,
+                "bin_number": 0,
+                "incorrect_count": 0,
+                "next_review": now,
+                "created_at": now,
+                "updated_at": now,
+            })
+        user_ids = list({row["user_id"] for row in rows})
+        
+        if skip_existing:
+            stmt = _dialect_insert(db)(Flashcard).on_conflict_do_nothing(
+                index_elements=[Flashcard.user_id, Flashcard.word]
+            ).returning(*RESPONSE_COLUMNS)
+        else:
+            stmt = insert(Flashcard).returning(*RESPONSE_COLUMNS, sort_by_parameter_order=True)
+        
+        try:
+            _lock_users(db, user_ids)
+            created = db.execute(stmt, rows).all()
         except IntegrityError:
             db.rollback()
-            raise ValueError(f"A flashcard with the word '{flashcard_data.word}' already exists for this user")
+            raise ValueError("A flashcard with one of these words already exists for this user")
+        
+        over_limit = db.query(Flashcard.user_id).filter(
+            Flashcard.user_id.in_(user_ids)
+        ).group_by(Flashcard.user_id).having(
+            func.count() > settings.MAX_FLASHCARDS_PER_USER
+        ).first()
+        if over_limit:
+            db.rollback()
+            raise ValueError(f"You have reached the maximum limit of {settings.MAX_FLASHCARDS_PER_USER} flashcards per user")
+        
+        db.commit()
+        flashcard_count_cache.delete(*user_ids)
+        study_status_cache.delete(*user_ids)
+        logger.info("Bulk created %s flashcards", len(created))
+        return created
     
     @staticmethod
     def get_flashcard_by_id(db: Session, flashcard_id: str) -> Optional[Flashcard]:
@@ -79,7 +269,23 @@ class FlashcardService:
         Returns:
             Flashcard if found, None otherwise
         """
-        return db.query(Flashcard).filter(Flashcard.id == flashcard_id).first()
+        return db.query(Flashcard).options(raiseload("*")).filter(Flashcard.id == flashcard_id).first()
+    
+    @staticmethod
+    def get_flashcard_updated_at(db: Session, flashcard_id: str) -> Optional[datetime]:
+        """
+        Get when a flashcard was last modified, without loading the row.
+        
+        Args:
+            db: Database session
+            flashcard_id: Flashcard ID
+            
+        Returns:
+            Last modification time if found, None otherwise
+        """
+        return db.query(
+            func.coalesce(Flashcard.updated_at, Flashcard.created_at)
+        ).filter(Flashcard.id == flashcard_id).scalar()
     
     @staticmethod
     def get_flashcard_by_word(db: Session, word: str, user_id: str) -> Optional[Flashcard]:
@@ -106,10 +312,13 @@ class FlashcardService:
         skip: int = 0, 
         limit: int = 100,
         include_hard: bool = True
-    ) -> List[Flashcard]:
+    ) -> List[Row]:
         """
         Get all flashcards for a specific user with pagination.
         
+        Only the columns of a flashcard response are selected; rows support
+        attribute access like the ORM objects they stand in for.
+        
         Args:
             db: Database session
             user_id: User ID to filter by
@@ -118,15 +327,141 @@ class FlashcardService:
             include_hard: Whether to include hard to remember cards
             
         Returns:
-            List of flashcards
+            List of flashcard rows
         """
-        query = db.query(Flashcard).filter(Flashcard.user_id == user_id)
+        query = db.query(*RESPONSE_COLUMNS).filter(Flashcard.user_id == user_id)
         
         if not include_hard:
-            query = query.filter(Flashcard.is_hard_to_remember == False)
+            query = query.filter(~Flashcard.is_hard_to_remember)
         
+        query = query.order_by(Flashcard.next_review.asc(), Flashcard.id.asc())
         return query.offset(skip).limit(limit).all()
     
+    @staticmethod
+    def get_flashcards_page(
+        db: Session,
+        user_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        include_hard: bool = True
+    ) -> Tuple[List[Row], int]:
+        """
+        Get a page of flashcards together with the user's total count.
+        
+        The total is computed with ``COUNT(*) OVER ()`` in the same query, so
+        a paged listing costs one database round-trip instead of two.
+        
+        Args:
+            db: Database session
+            user_id: User ID to filter by
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            include_hard: Whether to include hard to remember cards
+            
+        Returns:
+            Tuple of (flashcard rows, total count)
+        """
+        query = db.query(
+            *RESPONSE_COLUMNS, func.count().over().label("total_count")
+        ).filter(Flashcard.user_id == user_id)
+        
+        if not include_hard:
+            query = query.filter(~Flashcard.is_hard_to_remember)
+        
+        rows = query.order_by(
+            Flashcard.next_review.asc(), Flashcard.id.asc()
+        ).offset(skip).limit(limit).all()
+        
+        if rows:
+            return rows, rows[0].total_count
+        if skip == 0:
+            return rows, 0
+        # Past the last page the window has no rows to report on
+        return rows, FlashcardService.count_flashcards(db, user_id, include_hard)
+    
+    @staticmethod
+    def get_flashcards_after_cursor(
+        db: Session,
+        user_id: str,
+        limit: int = 100,
+        include_hard: bool = True,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Row], Optional[str], bool]:
+        """
+        Get a page of flashcards for a user using keyset pagination.
+        
+        Rows are ordered by (next_review, id) and the page starts strictly
+        after the position encoded in ``cursor``, so the cost of fetching a
+        page does not grow with its depth.
+        
+        Args:
+            db: Database session
+            user_id: User ID to filter by
+            limit: Maximum number of records to return
+            include_hard: Whether to include hard to remember cards
+            cursor: Cursor returned by the previous page, or None for the first page
+            
+        Returns:
+            Tuple of (flashcard rows, next_cursor, has_more)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = db.query(*RESPONSE_COLUMNS).filter(Flashcard.user_id == user_id)
+        
+        if not include_hard:
+            query = query.filter(~Flashcard.is_hard_to_remember)
+        
+        if cursor:
+            cursor_review, cursor_id = decode_cursor(cursor)
+            query = query.filter(
+                tuple_(Flashcard.next_review, Flashcard.id) > tuple_(cursor_review, cursor_id)
+            )
+        
+        # Fetch one extra row to find out whether another page exists
+        flashcards = query.order_by(
+            Flashcard.next_review.asc(), Flashcard.id.asc()
+        ).limit(limit + 1).all()
+        
+        has_more = len(flashcards) > limit
+        flashcards = flashcards[:limit]
+        next_cursor = None
+        if has_more:
+            last = flashcards[-1]
+            next_cursor = encode_cursor(last.next_review, last.id)
+        
+        return flashcards, next_cursor, has_more
+    
+    @staticmethod
+    def iter_flashcards(
+        db: Session,
+        user_id: str,
+        include_hard: bool = True,
+        batch_size: int = 500
+    ) -> Iterator[Row]:
+        """
+        Iterate over all flashcards for a user without loading them at once.
+        
+        Rows are fetched from the database in batches of ``batch_size``.
+        
+        Args:
+            db: Database session
+            user_id: User ID to filter by
+            include_hard: Whether to include hard to remember cards
+            batch_size: Number of rows fetched per round-trip
+            
+        Returns:
+            Iterator of flashcard rows ordered by review time
+        """
+        query = db.query(*RESPONSE_COLUMNS).filter(Flashcard.user_id == user_id)
+        
+        if not include_hard:
+            query = query.filter(~Flashcard.is_hard_to_remember)
+        
+        return iter(query.order_by(
+            Flashcard.next_review.asc(), Flashcard.id.asc()
+        ).yield_per(batch_size))
+    
     @staticmethod
     def count_flashcards(db: Session, user_id: str, include_hard: bool = True) -> int:
         """
@@ -140,21 +475,23 @@ class FlashcardService:
         Returns:
             Total count of flashcards
         """
-        query = db.query(Flashcard).filter(Flashcard.user_id == user_id)
+        # select(func.count()) counts in place; Query.count() would wrap a
+        # SELECT of every column in a subquery
+        stmt = select(func.count()).select_from(Flashcard).where(Flashcard.user_id == user_id)
         
         if not include_hard:
-            query = query.filter(Flashcard.is_hard_to_remember == False)
+            stmt = stmt.where(~Flashcard.is_hard_to_remember)
         
-        return query.count()
+        return db.execute(stmt).scalar_one()
     
     @staticmethod
     def update_flashcard(
         db: Session, 
         flashcard_id: str, 
         flashcard_data: FlashcardUpdate
-    ) -> Optional[Flashcard]:
+    ) -> Optional[Row]:
         """
-        Update an existing flashcard.
+        Update an existing flashcard with a single ``UPDATE ... RETURNING``.
         
         Args:
             db: Database session
@@ -162,46 +499,53 @@ class FlashcardService:
             flashcard_data: Update data
             
         Returns:
-            Updated flashcard if successful, None if not found
+            Row of the updated flashcard if successful, None if not found
             
         Raises:
             ValueError: If word already exists for another card
         """
-        flashcard = FlashcardService.get_flashcard_by_id(db, flashcard_id)
-        if not flashcard:
-            return None
-        
-        update_data = flashcard_data.dict(exclude_unset=True)
+        update_data = flashcard_data.model_dump(exclude_unset=True)
         
-        # Check for word conflicts if word is being updated
-        if "word" in update_data:
-            existing = db.query(Flashcard).filter(
-                Flashcard.word == update_data["word"],
-                Flashcard.user_id == flashcard.user_id,
-                Flashcard.id != flashcard_id
-            ).first()
-            if existing:
-                raise ValueError(f"A flashcard with the word '{update_data['word']}' already exists for this user")
+        # Reassigning a card changes the count of both owners, so the
+        # previous owner is only looked up in that case
+        previous_user_id = None
+        if "user_id" in update_data:
+            previous_user_id = db.execute(
+                select(Flashcard.user_id).where(Flashcard.id == flashcard_id)
+            ).scalar()
+            if previous_user_id is None:
+                return None
         
+        # Word conflicts are caught by the uq_fc_user_word constraint
         try:
-            for field, value in update_data.items():
-                setattr(flashcard, field, value)
-            
-            flashcard.updated_at = datetime.utcnow()
+            flashcard = db.execute(
+                update(Flashcard)
+                .where(Flashcard.id == flashcard_id)
+                .values(**update_data, updated_at=datetime.utcnow())
+                .returning(*RESPONSE_COLUMNS)
+            ).first()
+            if flashcard is None:
+                db.rollback()
+                return None
             db.commit()
-            db.refresh(flashcard)
-            
-            logger.info(f"Updated flashcard: {flashcard.word}")
-            return flashcard
-            
         except IntegrityError:
             db.rollback()
+            # A null word breaks NOT NULL rather than the uniqueness constraint
+            if update_data.get("word") is not None:
+                raise ValueError(f"A flashcard with the word '{update_data['word']}' already exists for this user")
             raise ValueError("Failed to update flashcard due to constraint violation")
+        
+        user_ids = {flashcard.user_id, previous_user_id or flashcard.user_id}
+        flashcard_count_cache.delete(*user_ids)
+        study_status_cache.delete(*user_ids)
+        
+        logger.info("Updated flashcard: %s", flashcard.word)
+        return flashcard
     
     @staticmethod
     def delete_flashcard(db: Session, flashcard_id: str) -> bool:
         """
-        Delete a flashcard.
+        Delete a flashcard with a single ``DELETE ... RETURNING``.
         
         Args:
             db: Database session
@@ -210,14 +554,20 @@ class FlashcardService:
         Returns:
             True if deleted, False if not found
         """
-        flashcard = FlashcardService.get_flashcard_by_id(db, flashcard_id)
-        if not flashcard:
+        flashcard = db.execute(
+            delete(Flashcard)
+            .where(Flashcard.id == flashcard_id)
+            .returning(Flashcard.user_id, Flashcard.word)
+        ).first()
+        if flashcard is None:
+            db.rollback()
             return False
         
-        db.delete(flashcard)
         db.commit()
+        flashcard_count_cache.delete(flashcard.user_id)
+        study_status_cache.delete(flashcard.user_id)
         
-        logger.info(f"Deleted flashcard: {flashcard.word}")
+        logger.info("Deleted flashcard: %s", flashcard.word)
         return True
     
     @staticmethod
@@ -225,6 +575,9 @@ class FlashcardService:
         """
         Get flashcard statistics for a user.
         
+        The count is cached per user for ``STATS_CACHE_TTL`` seconds and
+        invalidated whenever this service changes the user's flashcards.
+        
         Args:
             db: Database session
             user_id: User ID
@@ -232,7 +585,12 @@ class FlashcardService:
         Returns:
             Dictionary with flashcard count, limit, and remaining slots
         """
-        count = db.query(Flashcard).filter(Flashcard.user_id == user_id).count()
+        count = flashcard_count_cache.get(user_id)
+        if count is None:
+            count = db.execute(
+                select(func.count()).select_from(Flashcard).where(Flashcard.user_id == user_id)
+            ).scalar_one()
+            flashcard_count_cache.set(user_id, count)
         limit = settings.MAX_FLASHCARDS_PER_USER
         remaining = max(0, limit - count)
         
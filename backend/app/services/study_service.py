@@ -2,22 +2,98 @@
 Business logic for study session operations.
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from sqlalchemy import (
+    Row,
+    and_,
+    bindparam,
+    case,
+    func,
+    lambda_stmt,
+    literal_column,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.orm import Session
 import logging
 
 from app.models import Flashcard
 from app.schemas import StudyStatusResponse
+from app.core.cache import study_status_cache
 from app.core.config import settings
+from app.services.flashcard_service import RESPONSE_COLUMNS
 
 logger = logging.getLogger(__name__)
 
+# Delay until the next review, indexed by bin number. Bin 0 (new) is due
+# immediately and bin 11 (completed) is pushed 100 years out.
+_BIN_DELTAS = tuple(
+    timedelta(seconds=seconds) for seconds in settings.BIN_TIMESPANS[:11]
+) + (timedelta(days=365 * 100),)
+
+# The study-loop SELECTs are built once as lambda statements, so repeated
+# calls skip statement construction and reuse the cached compiled SQL; only
+# the ``user_id`` and ``now`` parameters are bound per call.
+
+# Cards in bins 1-10 that are ready for review, then new cards from bin 0.
+# The priority column keeps ready cards first, highest bin first.
+_NEXT_CARD_STMT = lambda_stmt(lambda: union_all(
+    select(*RESPONSE_COLUMNS, literal_column("0").label("priority")).where(
+        Flashcard.user_id == bindparam("user_id"),
+        Flashcard.bin_number >= 1,
+        Flashcard.bin_number < 11,  # Exclude completed cards (bin 11)
+        Flashcard.next_review <= bindparam("now"),
+        ~Flashcard.is_hard_to_remember
+    ),
+    select(*RESPONSE_COLUMNS, literal_column("1").label("priority")).where(
+        Flashcard.user_id == bindparam("user_id"),
+        Flashcard.bin_number == 0,
+        ~Flashcard.is_hard_to_remember
+    ),
+).order_by(
+    literal_column("priority"),
+    literal_column("bin_number").desc()
+).limit(1))
+
+# All five study status counts from a single pass over the user's cards
+_STUDY_COUNTS_STMT = lambda_stmt(lambda: select(
+    # Cards ready for review (bins 1-10, ready now)
+    func.count().filter(and_(
+        ~Flashcard.is_hard_to_remember,
+        Flashcard.bin_number >= 1,
+        Flashcard.bin_number < 11,
+        Flashcard.next_review <= bindparam("now")
+    )).label("ready"),
+    # New cards (bin 0)
+    func.count().filter(and_(
+        ~Flashcard.is_hard_to_remember, Flashcard.bin_number == 0
+    )).label("new"),
+    # Active cards (not hard to remember, not completed)
+    func.count().filter(and_(
+        ~Flashcard.is_hard_to_remember, Flashcard.bin_number < 11
+    )).label("active"),
+    # Completed cards (bin 11)
+    func.count().filter(and_(
+        ~Flashcard.is_hard_to_remember, Flashcard.bin_number == 11
+    )).label("completed"),
+    # Hard to remember cards
+    func.count().filter(Flashcard.is_hard_to_remember).label("hard"),
+    # When the next scheduled card comes due, which changes the counts
+    func.min(Flashcard.next_review).filter(and_(
+        ~Flashcard.is_hard_to_remember,
+        Flashcard.bin_number >= 1,
+        Flashcard.bin_number < 11,
+        Flashcard.next_review > bindparam("now")
+    )).label("next_due"),
+).where(Flashcard.user_id == bindparam("user_id")))
+
 
 class StudyService:
     """Service class for study session business logic."""
     
     @staticmethod
-    def get_next_card_for_review(db: Session, user_id: str) -> Optional[Flashcard]:
+    def get_next_card_for_review(db: Session, user_id: str) -> Optional[Row]:
         """
         Get the next card for review for a specific user based on spaced repetition logic.
         
@@ -30,44 +106,28 @@ class StudyService:
             user_id: User ID to filter by
             
         Returns:
-            Next flashcard to review, or None if no cards available
+            Row of the next flashcard to review, or None if no cards available
         """
         now = datetime.utcnow()
         
-        # First, check for cards in bins 1-10 that are ready for review
-        # Order by bin_number descending to prioritize higher bins
-        ready_card = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.bin_number >= 1,
-            Flashcard.bin_number < 11,  # Exclude completed cards (bin 11)
-            Flashcard.next_review <= now,
-            Flashcard.is_hard_to_remember == False
-        ).order_by(Flashcard.bin_number.desc()).first()
-        
-        if ready_card:
-            logger.info(f"Found ready card: {ready_card.word} (bin {ready_card.bin_number}) for user {user_id}")
-            return ready_card
-        
-        # If no ready cards, get a new card from bin 0
-        new_card = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.bin_number == 0,
-            Flashcard.is_hard_to_remember == False
+        card = db.execute(
+            _NEXT_CARD_STMT, {"user_id": user_id, "now": now}
         ).first()
         
-        if new_card:
-            logger.info(f"Found new card: {new_card.word} for user {user_id}")
+        if card:
+            logger.info("Found card: %s (bin %s) for user %s", card.word, card.bin_number, user_id)
         else:
-            logger.info(f"No cards available for review for user {user_id}")
+            logger.info("No cards available for review for user %s", user_id)
             
-        return new_card
+        return card
     
     @staticmethod
     def update_card_after_review(
         db: Session, 
         card_id: str, 
-        correct: bool
-    ) -> Optional[Flashcard]:
+        correct: bool,
+        max_incorrect: Optional[int] = None
+    ) -> Optional[Row]:
         """
         Update a card after review based on spaced repetition algorithm.
         
@@ -75,120 +135,132 @@ class StudyService:
         - Correct answer: Move to next bin (max 11)
         - Incorrect answer: Increment error count, move to bin 1 (or mark hard if 10+ errors)
         
+        The transition is computed by the database in a single
+        ``UPDATE ... RETURNING`` statement. A correct answer for a completed
+        card (bin 11) changes nothing, so the row is read but not written.
+        
         Args:
             db: Database session
             card_id: ID of the card being reviewed
             correct: Whether the answer was correct
+            max_incorrect: Incorrect answers after which a card is marked
+                hard to remember (defaults to ``MAX_INCORRECT_COUNT``)
             
         Returns:
-            Updated flashcard, or None if not found
+            Row of the updated flashcard, or None if not found
         """
-        card = db.query(Flashcard).filter(Flashcard.id == card_id).first()
-        if not card:
-            logger.warning(f"Card not found for review: {card_id}")
-            return None
+        now = datetime.utcnow()
+        if max_incorrect is None:
+            max_incorrect = settings.MAX_INCORRECT_COUNT
         
-        old_bin = card.bin_number
+        stmt = update(Flashcard).where(Flashcard.id == card_id)
         
         if correct:
-            # Move to next bin (max 11)
-            if card.bin_number < 11:
-                card.bin_number += 1
-                logger.info(f"Card '{card.word}' promoted from bin {old_bin} to {card.bin_number}")
+            # Move to next bin; completed cards are left untouched
+            stmt = stmt.where(Flashcard.bin_number < 11)
+            new_bin = Flashcard.bin_number + 1
+            values = {"bin_number": new_bin}
         else:
-            # Increment incorrect count
-            card.incorrect_count += 1
-            
-            # Check if card should be marked as hard to remember
-            if card.incorrect_count >= settings.MAX_INCORRECT_COUNT:
-                card.is_hard_to_remember = True
-                logger.info(f"Card '{card.word}' marked as hard to remember ({card.incorrect_count} errors)")
-            else:
-                # Move back to bin 1 (unless already in bin 0)
-                if card.bin_number > 0:
-                    card.bin_number = 1
-                    logger.info(f"Card '{card.word}' demoted from bin {old_bin} to bin 1")
-        
-        # Calculate next review time
-        card.next_review = StudyService._calculate_next_review_time(card.bin_number)
-        card.updated_at = datetime.utcnow()
+            new_incorrect_count = Flashcard.incorrect_count + 1
+            becomes_hard = new_incorrect_count >= max_incorrect
+            # Move back to bin 1 (unless already in bin 0 or now hard to remember)
+            new_bin = case(
+                (and_(~becomes_hard, Flashcard.bin_number > 0), 1),
+                else_=Flashcard.bin_number
+            )
+            values = {
+                "bin_number": new_bin,
+                "incorrect_count": new_incorrect_count,
+                "is_hard_to_remember": case(
+                    (becomes_hard, True),
+                    else_=Flashcard.is_hard_to_remember
+                ),
+            }
+        
+        # Next review time for the new bin
+        values["next_review"] = case(
+            {bin_number: now + delta for bin_number, delta in enumerate(_BIN_DELTAS)},
+            value=new_bin
+        )
+        values["updated_at"] = now
+        
+        card = db.execute(stmt.values(**values).returning(*RESPONSE_COLUMNS)).first()
+        if card is None and correct:
+            # Either missing or already completed; only the latter is returned
+            card = db.execute(
+                select(*RESPONSE_COLUMNS).where(Flashcard.id == card_id)
+            ).first()
+            if card is not None:
+                logger.info("Card '%s' reviewed (correct=True), already completed", card.word)
+                return card
+        if card is None:
+            logger.warning("Card not found for review: %s", card_id)
+            return None
         
         db.commit()
-        db.refresh(card)
+        study_status_cache.delete(card.user_id)
+        
+        if card.is_hard_to_remember:
+            logger.info("Card '%s' is hard to remember (%s errors)", card.word, card.incorrect_count)
+        else:
+            logger.info("Card '%s' reviewed (correct=%s), now in bin %s", card.word, correct, card.bin_number)
         
         return card
     
     @staticmethod
-    def _calculate_next_review_time(bin_number: int) -> datetime:
+    def _calculate_next_review_time(bin_number: int, now: datetime) -> datetime:
         """
         Calculate the next review time based on bin number.
         
         Args:
             bin_number: Current bin number (0-11)
+            now: Time of the review
             
         Returns:
             Next review datetime
         """
-        if bin_number == 0:
-            # New cards are available immediately
-            return datetime.utcnow()
-        elif bin_number == 11:
-            # Completed cards - never review again (far future)
-            return datetime.utcnow() + timedelta(days=365 * 100)
-        else:
-            # Use configured timespan for the bin
-            timespan_seconds = settings.BIN_TIMESPANS.get(bin_number, 86400)  # Default to 1 day
-            return datetime.utcnow() + timedelta(seconds=timespan_seconds)
+        return now + _BIN_DELTAS[bin_number]
     
     @staticmethod
-    def get_study_status(db: Session, user_id: str) -> StudyStatusResponse:
+    def get_study_status(
+        db: Session, user_id: str, now: Optional[datetime] = None
+    ) -> StudyStatusResponse:
         """
         Get comprehensive study session status for a specific user.
         
+        Statuses for the current time are cached per user for up to
+        ``STUDY_STATUS_CACHE_TTL`` seconds. An entry never outlives the moment
+        the user's next scheduled card comes due, every flashcard write for
+        the user invalidates it, and a status whose entry was invalidated
+        while it was being counted is not stored. The cache is per process,
+        so writes handled by another worker are only seen once it expires.
+        
         Args:
             db: Database session
             user_id: User ID to filter by
+            now: Time to check readiness against (defaults to the current
+                time; an explicit time bypasses the cache)
             
         Returns:
             Study status with detailed counts and message
         """
-        now = datetime.utcnow()
+        use_cache = now is None
+        if use_cache:
+            cached = study_status_cache.get(user_id)
+            if cached is not None:
+                return cached
+            token = study_status_cache.token()
+            now = datetime.utcnow()
         
-        # Count cards ready for review (bins 1-10, ready now)
-        ready_cards_count = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.bin_number >= 1,
-            Flashcard.bin_number < 11,
-            Flashcard.next_review <= now,
-            Flashcard.is_hard_to_remember == False
-        ).count()
-        
-        # Count new cards (bin 0)
-        new_cards_count = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.bin_number == 0,
-            Flashcard.is_hard_to_remember == False
-        ).count()
-        
-        # Count total active cards (not hard to remember, not completed)
-        total_active_cards = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.is_hard_to_remember == False,
-            Flashcard.bin_number < 11
-        ).count()
-        
-        # Count completed cards (bin 11)
-        completed_cards = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.bin_number == 11,
-            Flashcard.is_hard_to_remember == False
-        ).count()
-        
-        # Count hard to remember cards
-        hard_cards = db.query(Flashcard).filter(
-            Flashcard.user_id == user_id,
-            Flashcard.is_hard_to_remember == True
-        ).count()
+        counts = db.execute(
+            _STUDY_COUNTS_STMT, {"user_id": user_id, "now": now}
+        ).one()
+        
+        ready_cards_count = counts.ready
+        new_cards_count = counts.new
+        total_active_cards = counts.active
+        completed_cards = counts.completed
+        hard_cards = counts.hard
         
         # Generate status message
         if ready_cards_count > 0 or new_cards_count > 0:
@@ -201,7 +273,8 @@ class StudyService:
             message = "You have no more words to review; you are permanently done!"
             has_cards = False
         
-        return StudyStatusResponse(
+        # Counts come straight from the database, so skip re-validation
+        status = StudyStatusResponse.model_construct(
             message=message,
             has_cards=has_cards,
             ready_cards_count=ready_cards_count,
@@ -210,3 +283,37 @@ class StudyService:
             completed_cards=completed_cards,
             hard_cards=hard_cards
         )
+        
+        if use_cache:
+            ttl = settings.STUDY_STATUS_CACHE_TTL
+            if counts.next_due is not None:
+                ttl = min(ttl, (counts.next_due - now).total_seconds())
+            study_status_cache.set(user_id, status, ttl, token)
+        
+        return status
+    
+    @staticmethod
+    def get_study_session(
+        db: Session, user_id: str
+    ) -> Tuple[StudyStatusResponse, Optional[Row]]:
+        """
+        Get the study status and the next card to review in one call.
+        
+        The status is always counted fresh rather than taken from the study
+        status cache: a cached entry can be stale (the cache is per process,
+        so another worker's writes do not invalidate it), and a stale
+        "temporarily done" would hide a card that is ready now.
+        
+        Args:
+            db: Database session
+            user_id: User ID to filter by
+            
+        Returns:
+            Tuple of the study status and the next flashcard row (None if no
+            cards are available)
+        """
+        status = StudyService.get_study_status(db, user_id, now=datetime.utcnow())
+        # has_cards covers exactly the cards the next-card query can return
+        if not status.has_cards:
+            return status, None
+        return status, StudyService.get_next_card_for_review(db, user_id)
@@ -1,12 +1,15 @@
 """
 Service layer for user operations.
 """
-from sqlalchemy.orm import Session
+from datetime import datetime
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session, raiseload, selectinload
 from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 import logging
 
-from app.models import User
+from app.core.cache import flashcard_count_cache, study_status_cache
+from app.models import Flashcard, User
 from app.schemas import UserCreate, UserUpdate
 
 logger = logging.getLogger(__name__)
@@ -31,13 +34,15 @@ class UserService:
             ValueError: If user name already exists or maximum users exceeded
         """
         # Check if we already have 5 users
-        user_count = db.query(User).count()
+        user_count = UserService.count_users(db)
         if user_count >= 5:
             raise ValueError("Maximum number of users (5) already reached")
         
         # Check if name already exists
-        existing_user = db.query(User).filter(User.name == user_data.name).first()
-        if existing_user:
+        name_taken = db.execute(
+            select(exists().where(User.name == user_data.name))
+        ).scalar()
+        if name_taken:
             raise ValueError(f"User with name '{user_data.name}' already exists")
         
         db_user = User(name=user_data.name)
@@ -46,11 +51,11 @@ class UserService:
             db.add(db_user)
             db.commit()
             db.refresh(db_user)
-            logger.info(f"✅ Created user: {user_data.name}")
+            logger.info("✅ Created user: %s", user_data.name)
             return db_user
         except IntegrityError:
             db.rollback()
-            logger.error(f"⚠️ Failed to create user due to integrity error: {user_data.name}")
+            logger.error("⚠️ Failed to create user due to integrity error: %s", user_data.name)
             raise ValueError(f"User with name '{user_data.name}' already exists")
     
     @staticmethod
@@ -62,23 +67,47 @@ class UserService:
             db: Database session
             
         Returns:
-            List of all users
+            List of all users. Relationships are not loaded; touching one
+            raises instead of issuing a lazy load per user
         """
-        return db.query(User).order_by(User.created_at).all()
+        return db.query(User).options(raiseload("*")).order_by(User.created_at).all()
     
     @staticmethod
-    def get_user_by_id(db: Session, user_id: str) -> Optional[User]:
+    def get_user_by_id(
+        db: Session, user_id: str, load_flashcards: bool = False
+    ) -> Optional[User]:
         """
         Get a user by ID.
         
         Args:
             db: Database session
             user_id: User ID
+            load_flashcards: Eagerly load the user's flashcards with one extra
+                SELECT; otherwise accessing them raises instead of lazy loading
             
         Returns:
             User if found, None otherwise
         """
-        return db.query(User).filter(User.id == user_id).first()
+        options = [raiseload("*")]
+        if load_flashcards:
+            options.insert(0, selectinload(User.flashcards))
+        return db.query(User).options(*options).filter(User.id == user_id).first()
+    
+    @staticmethod
+    def get_user_updated_at(db: Session, user_id: str) -> Optional[datetime]:
+        """
+        Get when a user was last modified, without loading the row.
+        
+        Args:
+            db: Database session
+            user_id: User ID
+            
+        Returns:
+            Last modification time if found, None otherwise
+        """
+        return db.query(
+            func.coalesce(User.updated_at, User.created_at)
+        ).filter(User.id == user_id).scalar()
     
     @staticmethod
     def get_user_by_name(db: Session, name: str) -> Optional[User]:
@@ -114,25 +143,28 @@ class UserService:
         if not db_user:
             return None
         
-        if user_update.name is not None:
-            # Check if new name already exists (except for current user)
-            existing_user = db.query(User).filter(
-                User.name == user_update.name,
-                User.id != user_id
-            ).first()
-            if existing_user:
-                raise ValueError(f"User with name '{user_update.name}' already exists")
-            
-            db_user.name = user_update.name
+        # Nothing to write; skip the conflict check and the commit
+        if user_update.name is None or user_update.name == db_user.name:
+            return db_user
+        
+        # Check if new name already exists (except for current user)
+        name_taken = db.execute(select(exists().where(
+            User.name == user_update.name,
+            User.id != user_id
+        ))).scalar()
+        if name_taken:
+            raise ValueError(f"User with name '{user_update.name}' already exists")
+        
+        db_user.name = user_update.name
         
         try:
             db.commit()
             db.refresh(db_user)
-            logger.info(f"✅ Updated user: {user_id}")
+            logger.info("✅ Updated user: %s", user_id)
             return db_user
         except IntegrityError:
             db.rollback()
-            logger.error(f"⚠️ Failed to update user due to integrity error: {user_id}")
+            logger.error("⚠️ Failed to update user due to integrity error: %s", user_id)
             raise ValueError(f"User with name '{user_update.name}' already exists")
     
     @staticmethod
@@ -147,18 +179,26 @@ class UserService:
         Returns:
             True if deleted, False if not found
         """
-        db_user = db.query(User).filter(User.id == user_id).first()
-        if not db_user:
-            return False
-        
         try:
-            db.delete(db_user)
+            # Databases created before the foreign key gained ON DELETE
+            # CASCADE (see scripts/migrate_cascade_user_flashcards.sh) would
+            # reject the user DELETE, so remove the flashcards explicitly
+            db.execute(delete(Flashcard).where(Flashcard.user_id == user_id))
+            # RETURNING tells whether the user existed
+            deleted_id = db.execute(
+                delete(User).where(User.id == user_id).returning(User.id)
+            ).scalar_one_or_none()
+            if deleted_id is None:
+                db.rollback()
+                return False
             db.commit()
-            logger.info(f"✅ Deleted user: {user_id}")
+            flashcard_count_cache.delete(user_id)
+            study_status_cache.delete(user_id)
+            logger.info("✅ Deleted user: %s", user_id)
             return True
         except Exception as e:
             db.rollback()
-            logger.error(f"⚠️ Failed to delete user {user_id}: {e}")
+            logger.error("⚠️ Failed to delete user %s: %s", user_id, e)
             raise
     
     @staticmethod
@@ -172,4 +212,4 @@ class UserService:
         Returns:
             Total number of users
         """
-        return db.query(User).count()
+        return db.execute(select(func.count()).select_from(User)).scalar_one()
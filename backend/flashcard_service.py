@@ -1,22 +1,55 @@
 from datetime import datetime, timedelta
 from typing import List, Optional
+from sqlalchemy import and_, bindparam, func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from database import Flashcard
 
-# Bin timespans in seconds
-BIN_TIMESPANS = {
-    1: 5,           # 5 seconds
-    2: 25,          # 25 seconds  
-    3: 120,         # 2 minutes
-    4: 600,         # 10 minutes
-    5: 3600,        # 1 hour
-    6: 18000,       # 5 hours
-    7: 86400,       # 1 day
-    8: 432000,      # 5 days
-    9: 2160000,     # 25 days
-    10: 10368000,   # 4 months (120 days)
-    11: float('inf') # never
-}
+# Delay until the next review, indexed by bin number
+BIN_DELTAS = (
+    timedelta(0),                # 0: new, due immediately
+    timedelta(seconds=5),        # 1: 5 seconds
+    timedelta(seconds=25),       # 2: 25 seconds
+    timedelta(minutes=2),        # 3: 2 minutes
+    timedelta(minutes=10),       # 4: 10 minutes
+    timedelta(hours=1),          # 5: 1 hour
+    timedelta(hours=5),          # 6: 5 hours
+    timedelta(days=1),           # 7: 1 day
+    timedelta(days=5),           # 8: 5 days
+    timedelta(days=25),          # 9: 25 days
+    timedelta(days=120),         # 10: 4 months
+    timedelta(days=365 * 100),   # 11: never (far future)
+)
+
+_ACTIVE = ~Flashcard.is_hard_to_remember
+
+# Statements are built once at import; SQLAlchemy's compiled cache then
+# reuses their SQL on every call and only "now" is bound per execution
+
+# Highest-bin card in bins 1-11 that is due for review
+_READY_CARD_STMT = select(Flashcard).where(
+    Flashcard.bin_number.between(1, 11),
+    Flashcard.next_review <= bindparam("now"),
+    _ACTIVE,
+).order_by(Flashcard.bin_number.desc()).limit(1)
+
+# Any new card from bin 0
+_NEW_CARD_STMT = select(Flashcard).where(
+    Flashcard.bin_number == 0,
+    _ACTIVE,
+).limit(1)
+
+# One pass over the table for every count the status message needs
+_STUDY_COUNTS_STMT = select(
+    # Cards ready for review
+    func.count().filter(and_(
+        _ACTIVE, Flashcard.bin_number >= 1, Flashcard.next_review <= bindparam("now")
+    )).label("ready"),
+    # New cards (bin 0)
+    func.count().filter(and_(_ACTIVE, Flashcard.bin_number == 0)).label("new"),
+    # Total active cards
+    func.count().filter(and_(_ACTIVE, Flashcard.bin_number < 11)).label("active"),
+)
 
 def create_flashcard(db: Session, word: str, definition: str) -> Flashcard:
     """Create a new flashcard."""
@@ -41,23 +74,13 @@ def get_next_card_for_review(db: Session) -> Optional[Flashcard]:
     now = datetime.utcnow()
     
     # First, check for cards in bins 1-11 that are ready for review
-    ready_cards = db.query(Flashcard).filter(
-        Flashcard.bin_number >= 1,
-        Flashcard.bin_number <= 11,
-        Flashcard.next_review <= now,
-        Flashcard.is_hard_to_remember == False
-    ).order_by(Flashcard.bin_number.desc()).all()
+    ready_card = db.execute(_READY_CARD_STMT, {"now": now}).scalar_one_or_none()
     
-    if ready_cards:
-        return ready_cards[0]
+    if ready_card:
+        return ready_card
     
     # If no ready cards, get a new card from bin 0
-    new_card = db.query(Flashcard).filter(
-        Flashcard.bin_number == 0,
-        Flashcard.is_hard_to_remember == False
-    ).first()
-    
-    return new_card
+    return db.execute(_NEW_CARD_STMT).scalar_one_or_none()
 
 def update_card_after_review(db: Session, card_id: str, correct: bool) -> Flashcard:
     """Update card after review."""
@@ -65,10 +88,17 @@ def update_card_after_review(db: Session, card_id: str, correct: bool) -> Flashc
     if not card:
         raise ValueError("Card not found")
     
+    # A completed card answered correctly has nothing to update
+    if correct and card.bin_number >= 11:
+        return card
+    
+    # One timestamp for the whole review
+    now = datetime.utcnow()
+    became_hard = False
+    
     if correct:
-        # Move to next bin (max 11)
-        if card.bin_number < 11:
-            card.bin_number += 1
+        # Move to next bin
+        card.bin_number += 1
     else:
         # Increment incorrect count
         card.incorrect_count += 1
@@ -76,60 +106,26 @@ def update_card_after_review(db: Session, card_id: str, correct: bool) -> Flashc
         # Check if card should be marked as hard to remember
         if card.incorrect_count >= 10:
             card.is_hard_to_remember = True
-            db.commit()
-            db.refresh(card)
-            return card
-        
+            became_hard = True
         # Move back to bin 1 (unless already in bin 0)
-        if card.bin_number > 0:
+        elif card.bin_number > 0:
             card.bin_number = 1
     
-    # Calculate next review time
-    if card.bin_number == 0:
-        card.next_review = datetime.utcnow()
-    elif card.bin_number == 11:
-        # Never review again
-        card.next_review = datetime.utcnow() + timedelta(days=365 * 100)  # Far future
-    else:
-        timespan = BIN_TIMESPANS[card.bin_number]
-        card.next_review = datetime.utcnow() + timedelta(seconds=timespan)
+    # Calculate next review time (a card that just became hard keeps its schedule)
+    if not became_hard:
+        card.next_review = now + BIN_DELTAS[card.bin_number]
     
+    # A single commit; the session keeps the written values loaded, so no
+    # refresh SELECT is needed
     db.commit()
-    db.refresh(card)
     return card
 
 def get_study_status(db: Session) -> dict:
     """Get current study status."""
-    # Count cards ready for review
-    now = datetime.utcnow()
-    ready_cards_count = db.query(Flashcard).filter(
-        Flashcard.bin_number >= 1,
-        Flashcard.next_review <= now,
-        Flashcard.is_hard_to_remember == False
-    ).count()
-    
-    # Count new cards (bin 0)
-    new_cards_count = db.query(Flashcard).filter(
-        Flashcard.bin_number == 0,
-        Flashcard.is_hard_to_remember == False
-    ).count()
-    
-    # Count total active cards
-    total_active = db.query(Flashcard).filter(
-        Flashcard.is_hard_to_remember == False,
-        Flashcard.bin_number < 11
-    ).count()
-    
-    # Count completed cards (bin 11)
-    completed_cards = db.query(Flashcard).filter(
-        Flashcard.bin_number == 11,
-        Flashcard.is_hard_to_remember == False
-    ).count()
-    
-    # Count hard to remember cards
-    hard_cards = db.query(Flashcard).filter(
-        Flashcard.is_hard_to_remember == True
-    ).count()
+    counts = db.execute(_STUDY_COUNTS_STMT, {"now": datetime.utcnow()}).one()
+    ready_cards_count = counts.ready
+    new_cards_count = counts.new
+    total_active = counts.active
     
     if ready_cards_count > 0 or new_cards_count > 0:
         return {
@@ -153,20 +149,15 @@ def update_flashcard(db: Session, card_id: str, word: str, definition: str) -> F
     if not card:
         raise ValueError("Flashcard not found")
     
-    # Check if the new word already exists (and it's not the same card)
-    existing_card = db.query(Flashcard).filter(
-        Flashcard.word == word,
-        Flashcard.id != card_id
-    ).first()
-    if existing_card:
-        raise ValueError(f"A flashcard with the word '{word}' already exists")
-    
-    # Update the card
+    # Update the card; the unique constraint on word rejects duplicates
     card.word = word
     card.definition = definition
     
-    db.commit()
-    db.refresh(card)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError(f"A flashcard with the word '{word}' already exists")
     return card
 
 def delete_flashcard(db: Session, card_id: str) -> bool:
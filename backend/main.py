@@ -3,6 +3,8 @@ Flashcard Learning App Backend
 
 Entry point for the FastAPI application with modular architecture.
 """
+import sys
+
 import uvicorn
 from app.main import app
 from app.core.config import settings
@@ -13,5 +15,8 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
-        log_level="info"
+        loop="asyncio" if sys.platform == "win32" else "uvloop",  # uvloop has no Windows build
+        http="httptools",
+        log_level=settings.LOG_LEVEL.lower(),
+        access_log=settings.DEBUG
     )
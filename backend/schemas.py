@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from typing import Optional
 
@@ -7,6 +7,8 @@ class FlashcardCreate(BaseModel):
     definition: str
 
 class FlashcardResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
     id: str
     word: str
     definition: str
@@ -14,9 +16,6 @@ class FlashcardResponse(BaseModel):
     incorrect_count: int
     next_review: datetime
     is_hard_to_remember: bool
-    
-    class Config:
-        from_attributes = True
 
 class ReviewRequest(BaseModel):
     correct: bool
@@ -2,87 +2,246 @@
 Test configuration and fixtures for the flashcard application tests.
 """
 import pytest
-import os
-import tempfile
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from sqlalchemy import create_engine, delete, event, insert
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy.pool import StaticPool
 
-from app.main import create_app
+from app.core.cache import flashcard_count_cache, study_status_cache
 from app.db import get_db
 from app.models.flashcard import Base
 from app.models.user import User
 from app.models.flashcard import Flashcard
 
 
+_TRANSACTION_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK")
+
+
+class QueryCounter:
+    """Number of SQL statements an engine has executed."""
+
+    def __init__(self):
+        self.count = 0
+
+
+@contextmanager
+def count_queries(engine):
+    """Count the SQL statements executed on an engine inside the block."""
+    counter = QueryCounter()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # BEGIN/SAVEPOINT/RELEASE come from the rollback fixture, not the code under test
+        if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+            counter.count += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def query_count(test_db):
+    """
+    Count the SQL statements run inside a block of the test.
+
+    Unlike ``max_queries``, which covers the whole test body, this measures a
+    single call with its setup left out::
+
+        with query_count() as queries:
+            ...
+        assert queries.count <= 1
+    """
+    return lambda: count_queries(test_db)
+
+
+def pytest_configure(config):
+    # pytest.ini's [tool:pytest] section is ignored by pytest, so the markers
+    # that `make test-fast` (-m unit) and the test modules use live here
+    for marker in (
+        "unit: Unit tests",
+        "integration: Integration tests",
+        "api: API endpoint tests",
+        "slow: Slow running tests",
+        "max_queries(n): fail if the test body runs more than n SQL statements",
+    ):
+        config.addinivalue_line("markers", marker)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """
+    Record how many queries each database test runs, and enforce the
+    ceiling set by ``@pytest.mark.max_queries(n)``.
+
+    Only the test body is counted, so fixture setup does not eat into it.
+    """
+    engine = item.funcargs.get("test_db")
+    if engine is None:
+        return (yield)
+
+    with count_queries(engine) as counter:
+        result = yield
+    item.user_properties.append(("sql_queries", counter.count))
+
+    marker = item.get_closest_marker("max_queries")
+    if marker is not None and counter.count > marker.args[0]:
+        pytest.fail(
+            f"{item.name} ran {counter.count} SQL statements, "
+            f"expected at most {marker.args[0]}"
+        )
+    return result
+
+
 @pytest.fixture(scope="session")
 def test_db():
     """Create a test database for the session."""
-    # Use SQLite for testing
-    SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-    
+    # In-memory SQLite; StaticPool keeps the single connection (and with it
+    # the database) alive for the whole session. Every pytest-xdist worker is
+    # a separate process, so each gets a private database.
     engine = create_engine(
-        SQLALCHEMY_DATABASE_URL,
+        "sqlite://",
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
     
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    # SQLite leaves foreign keys (and ON DELETE CASCADE) off unless asked
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        for pragma in (
+            "foreign_keys=ON",
+            "cache_size=-64000",
+            "temp_store=MEMORY",
+        ):
+            dbapi_connection.execute(f"PRAGMA {pragma}")
+        # pysqlite's own transaction handling breaks SAVEPOINTs; let
+        # SQLAlchemy emit BEGIN itself instead
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def do_begin(connection):
+        connection.exec_driver_sql("BEGIN")
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
     
     yield engine
     
-    # Clean up after tests
-    Base.metadata.drop_all(bind=engine)
-    try:
-        os.remove("./test.db")
-    except FileNotFoundError:
-        pass
+    # Closing the connection discards the in-memory database
+    engine.dispose()
 
 
 @pytest.fixture
 def db_session(test_db):
-    """Create a database session for testing."""
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_db)
-    session = TestingSessionLocal()
+    """
+    Create a database session for testing.
+
+    The session is joined to an outer transaction that is rolled back after
+    the test; commits made by the test or the code under test only release
+    SAVEPOINTs, so no rows leak from one test into the next.
+
+    Every ORM query it runs refuses lazy loads, so an accidental N+1 fails
+    the test; code that needs a relationship has to load it eagerly.
+    """
+    connection = test_db.connect()
+    transaction = connection.begin()
+    session = Session(
+        bind=connection,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False,
+    )
+
+    @event.listens_for(session, "do_orm_execute")
+    def raise_on_lazy_load(orm_execute_state):
+        if (
+            orm_execute_state.is_select
+            and not orm_execute_state.is_column_load
+            and not orm_execute_state.is_relationship_load
+        ):
+            orm_execute_state.statement = orm_execute_state.statement.options(
+                raiseload("*")
+            )
+
     try:
         yield session
     finally:
         session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """Start the application once and share its test client across tests."""
+    # Imported here so unit-only runs (-m unit) never load the app or httpx
+    from fastapi.testclient import TestClient
+    from app.main import create_app
+    
+    app = create_app()
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
-def client(db_session):
+def client(app_client, db_session):
     """Create a test client with test database."""
-    app = create_app()
-    
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
     
+    app = app_client.app
     app.dependency_overrides[get_db] = override_get_db
-    
-    with TestClient(app) as test_client:
-        yield test_client
+    try:
+        yield app_client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app_client.cookies.clear()
 
 
-@pytest.fixture
-def test_user(db_session):
-    """Create a test user."""
-    user = User(
-        name="Test User"
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
+@pytest.fixture(scope="session")
+def _seed_user(test_db):
+    """
+    Insert the shared test user once per session.
+
+    It is committed outside every test's transaction, so each test's
+    rollback restores it however the test changed or deleted it.
+    """
+    with Session(test_db, expire_on_commit=False) as session:
+        user = User(name="Test User")
+        session.add(user)
+        session.commit()
     return user
 
 
+@pytest.fixture(autouse=True)
+def _isolate_seed_user(request):
+    """
+    Keep the shared test user from leaking state between tests.
+
+    Its ID is the same in every test, so the per-user caches are cleared,
+    and tests that did not ask for the user start without it.
+    """
+    flashcard_count_cache.clear()
+    study_status_cache.clear()
+    if "db_session" in request.fixturenames and "test_user" not in request.fixturenames:
+        # The seed commits on the shared connection, so it has to exist
+        # before db_session opens the test's transaction
+        seed_user = request.getfixturevalue("_seed_user")
+        db_session = request.getfixturevalue("db_session")
+        db_session.execute(delete(User).where(User.id == seed_user.id))
+        db_session.commit()
+
+
+@pytest.fixture
+def test_user(db_session, _seed_user):
+    """The shared test user, attached to the test's session."""
+    return db_session.merge(_seed_user, load=False)
+
+
 @pytest.fixture
 def test_flashcard(db_session, test_user):
     """Create a test flashcard."""
@@ -95,30 +254,32 @@ def test_flashcard(db_session, test_user):
     )
     db_session.add(flashcard)
     db_session.commit()
-    db_session.refresh(flashcard)
     return flashcard
 
 
 @pytest.fixture
 def multiple_flashcards(db_session, test_user):
     """Create multiple test flashcards."""
-    flashcards = []
     words = ["apple", "banana", "cherry", "date", "elderberry"]
+    rows = [
+        {
+            "word": word,
+            "definition": f"Definition for {word}",
+            "user_id": test_user.id,
+            "bin_number": i % 3,  # Mix of different bins
+            "incorrect_count": i % 2,  # Some correct, some incorrect
+        }
+        for i, word in enumerate(words)
+    ]
     
-    for i, word in enumerate(words):
-        flashcard = Flashcard(
-            word=word,
-            definition=f"Definition for {word}",
-            user_id=test_user.id,
-            bin_number=i % 3,  # Mix of different bins
-            incorrect_count=i % 2  # Some correct, some incorrect
-        )
-        db_session.add(flashcard)
-        flashcards.append(flashcard)
-    
+    # One INSERT ... RETURNING instead of a flush per object plus a refresh
+    # each. Plain rows come back rather than ORM instances, so the commit has
+    # nothing to expire and reading them later never reloads from the database.
+    flashcards = db_session.execute(
+        insert(Flashcard).returning(*Flashcard.__table__.c, sort_by_parameter_order=True),
+        rows,
+    ).all()
     db_session.commit()
-    for flashcard in flashcards:
-        db_session.refresh(flashcard)
     
     return flashcards
 
@@ -131,5 +292,4 @@ def second_user(db_session):
     )
     db_session.add(user)
     db_session.commit()
-    db_session.refresh(user)
     return user
@@ -3,6 +3,7 @@ Integration tests for flashcard API endpoints.
 """
 import pytest
 import json
+import asyncio
 from app.models.flashcard import Flashcard
 
 pytestmark = [pytest.mark.integration, pytest.mark.api]
@@ -55,6 +56,65 @@ def test_create_flashcard_invalid_data(client, test_user):
     assert response.status_code == 422  # Validation error
 
 
+def test_create_flashcard_whitespace_and_unknown_fields(client, test_user):
+    """Test that values are stripped and unknown fields are rejected."""
+    response = client.post("/api/v1/flashcards/", json={
+        "word": "  padded  ",
+        "definition": "  Surrounded by spaces  ",
+        "user_id": test_user.id
+    })
+    assert response.status_code == 201
+    assert response.json()["word"] == "padded"
+    
+    response = client.post("/api/v1/flashcards/", json={
+        "word": "extra",
+        "definition": "Has an unknown field",
+        "user_id": test_user.id,
+        "bin_number": 5
+    })
+    assert response.status_code == 422
+
+
+def test_bulk_create_flashcards(client, test_user):
+    """Test bulk flashcard creation via API."""
+    payload = [
+        {"word": f"bulk{i}", "definition": f"Bulk card {i}", "user_id": test_user.id}
+        for i in range(3)
+    ]
+    
+    response = client.post("/api/v1/flashcards/bulk", json=payload)
+    
+    assert response.status_code == 201
+    data = response.json()
+    assert [card["word"] for card in data] == ["bulk0", "bulk1", "bulk2"]
+    assert all(card["user_id"] == test_user.id for card in data)
+
+
+def test_bulk_create_flashcards_duplicate_in_batch(client, test_user):
+    """Test a batch repeating a word is rejected."""
+    payload = [
+        {"word": "twice", "definition": "Once", "user_id": test_user.id},
+        {"word": "twice", "definition": "Again", "user_id": test_user.id},
+    ]
+    
+    response = client.post("/api/v1/flashcards/bulk", json=payload)
+    
+    assert response.status_code == 400
+
+
+def test_bulk_create_flashcards_too_many(client, test_user):
+    """Test batches above 100 flashcards are rejected."""
+    payload = [
+        {"word": f"word{i}", "definition": "Definition", "user_id": test_user.id}
+        for i in range(101)
+    ]
+    
+    response = client.post("/api/v1/flashcards/bulk", json=payload)
+    
+    assert response.status_code == 422
+
+
+@pytest.mark.max_queries(1)
 def test_get_flashcards_list(client, test_user, multiple_flashcards):
     """Test getting flashcards list via API."""
     response = client.get(f"/api/v1/flashcards/?user_id={test_user.id}")
@@ -81,6 +141,36 @@ def test_get_flashcards_pagination(client, test_user, multiple_flashcards):
     assert data["total"] == len(multiple_flashcards)
 
 
+def test_get_flashcards_cursor_pagination(client, test_user, multiple_flashcards):
+    """Test keyset pagination via next_cursor."""
+    response = client.get(f"/api/v1/flashcards/?user_id={test_user.id}&per_page=3")
+    
+    assert response.status_code == 200
+    first_page = response.json()
+    assert len(first_page["flashcards"]) == 3
+    assert first_page["has_more"] is True
+    assert first_page["next_cursor"]
+    
+    response = client.get(
+        f"/api/v1/flashcards/?user_id={test_user.id}&per_page=3"
+        f"&cursor={first_page['next_cursor']}"
+    )
+    
+    assert response.status_code == 200
+    second_page = response.json()
+    assert len(second_page["flashcards"]) == 2
+    assert second_page["has_more"] is False
+    assert second_page["next_cursor"] is None
+    assert second_page["total"] == len(multiple_flashcards)
+
+
+def test_get_flashcards_invalid_cursor(client, test_user):
+    """Test that a malformed cursor returns 400."""
+    response = client.get(f"/api/v1/flashcards/?user_id={test_user.id}&cursor=garbage")
+    
+    assert response.status_code == 400
+
+
 def test_get_flashcards_exclude_hard(client, test_user, db_session):
     """Test excluding hard cards via API."""
     # Create a mix of regular and hard cards
@@ -113,6 +203,68 @@ def test_get_flashcards_exclude_hard(client, test_user, db_session):
     assert data["flashcards"][0]["word"] == "regular_api"
 
 
+@pytest.mark.max_queries(1)
+def test_export_flashcards(client, test_user, multiple_flashcards):
+    """Test streaming export of all flashcards for a user."""
+    response = client.get(f"/api/v1/flashcards/export?user_id={test_user.id}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == len(multiple_flashcards)
+    assert len(data["flashcards"]) == len(multiple_flashcards)
+    assert all(card["user_id"] == test_user.id for card in data["flashcards"])
+
+
+def test_export_flashcards_in_chunks(client, test_user, multiple_flashcards, monkeypatch):
+    """Test that chunked serialization joins into one valid JSON array."""
+    from app.api.v1 import flashcards as flashcards_api
+    monkeypatch.setattr(flashcards_api, "_EXPORT_BATCH_SIZE", 2)
+    
+    response = client.get(f"/api/v1/flashcards/export?user_id={test_user.id}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == len(multiple_flashcards)
+    assert {card["id"] for card in data["flashcards"]} == {card.id for card in multiple_flashcards}
+
+
+def test_export_flashcards_after_request_session_closed(
+    db_session, test_user, multiple_flashcards, monkeypatch
+):
+    """Test that the export stream does not read through the request's session."""
+    from app.api.v1.flashcards import export_flashcards
+    from app.services import FlashcardService
+    
+    sessions = []
+    iter_flashcards = FlashcardService.iter_flashcards
+    
+    def record_session(db, **kwargs):
+        sessions.append(db)
+        return iter_flashcards(db, **kwargs)
+    
+    monkeypatch.setattr(FlashcardService, "iter_flashcards", record_session)
+    
+    response = export_flashcards(user_id=test_user.id, include_hard=True, db=db_session)
+    # FastAPI 0.106+ closes dependency sessions before streaming the body
+    db_session.close()
+    
+    async def read_body():
+        return b"".join([chunk async for chunk in response.body_iterator])
+    
+    data = json.loads(asyncio.run(read_body()))
+    assert data["total"] == len(multiple_flashcards)
+    assert sessions and sessions[0] is not db_session
+
+
+def test_export_flashcards_empty(client, test_user):
+    """Test exporting a user without flashcards."""
+    response = client.get(f"/api/v1/flashcards/export?user_id={test_user.id}")
+    
+    assert response.status_code == 200
+    assert response.json() == {"flashcards": [], "total": 0}
+
+
+@pytest.mark.max_queries(1)
 def test_get_flashcard_by_id(client, test_flashcard):
     """Test getting single flashcard by ID via API."""
     response = client.get(f"/api/v1/flashcards/{test_flashcard.id}")
@@ -124,6 +276,29 @@ def test_get_flashcard_by_id(client, test_flashcard):
     assert data["definition"] == test_flashcard.definition
 
 
+def test_get_flashcard_etag(client, test_flashcard):
+    """Test conditional GET returns 304 while the flashcard is unchanged."""
+    response = client.get(f"/api/v1/flashcards/{test_flashcard.id}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    
+    response = client.get(
+        f"/api/v1/flashcards/{test_flashcard.id}",
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    
+    client.put(f"/api/v1/flashcards/{test_flashcard.id}", json={"definition": "Changed"})
+    response = client.get(
+        f"/api/v1/flashcards/{test_flashcard.id}",
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
 def test_get_flashcard_not_found(client):
     """Test getting non-existent flashcard via API."""
     response = client.get("/api/v1/flashcards/non-existent-id")
@@ -222,6 +397,7 @@ def test_delete_flashcard_not_found(client):
     assert data["detail"] == "Flashcard not found"
 
 
+@pytest.mark.max_queries(1)
 def test_get_flashcard_stats(client, test_user, multiple_flashcards):
     """Test getting flashcard statistics via API."""
     response = client.get(f"/api/v1/flashcards/stats?user_id={test_user.id}")
@@ -29,6 +29,7 @@ def test_get_next_card_success(client, test_user, db_session):
     assert data["user_id"] == test_user.id
 
 
+@pytest.mark.max_queries(1)
 def test_get_next_card_no_cards_available(client, test_user):
     """Test getting next card when no cards are available."""
     response = client.get(f"/api/v1/study/next?user_id={test_user.id}")
@@ -146,6 +147,14 @@ def test_review_card_invalid_data(client, test_flashcard):
     response = client.post(f"/api/v1/study/{test_flashcard.id}/review", json=review_data)
     
     assert response.status_code == 422  # Validation error
+    
+    # Unknown fields are rejected
+    response = client.post(
+        f"/api/v1/study/{test_flashcard.id}/review",
+        json={"correct": True, "bin_number": 11}
+    )
+    
+    assert response.status_code == 422
 
 
 def test_get_study_status_with_cards(client, test_user, db_session):
@@ -263,6 +272,7 @@ def test_get_study_status_permanently_done(client, test_user, db_session):
     assert "permanently done" in data["message"]
 
 
+@pytest.mark.max_queries(1)
 def test_get_study_status_no_cards(client, test_user):
     """Test study status when no cards exist."""
     response = client.get(f"/api/v1/study/status?user_id={test_user.id}")
@@ -285,6 +295,31 @@ def test_get_study_status_missing_user_id(client):
     assert response.status_code == 422  # Validation error
 
 
+@pytest.mark.max_queries(2)
+def test_get_study_session(client, test_user, test_flashcard):
+    """Test getting the study status and next card in one request."""
+    response = client.get(f"/api/v1/study/session?user_id={test_user.id}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"]["has_cards"] is True
+    assert data["status"]["new_cards_count"] == 1
+    assert data["next_card"]["id"] == test_flashcard.id
+    assert data["next_card"]["word"] == "test"
+
+
+@pytest.mark.max_queries(1)
+def test_get_study_session_no_cards(client, test_user):
+    """Test that the study session skips the next-card lookup when nothing is due."""
+    response = client.get(f"/api/v1/study/session?user_id={test_user.id}")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"]["has_cards"] is False
+    assert "permanently done" in data["status"]["message"]
+    assert data["next_card"] is None
+
+
 def test_study_workflow_integration(client, test_user, db_session):
     """Test complete study workflow: create card, get next, review, check status."""
     # Step 1: Create a flashcard
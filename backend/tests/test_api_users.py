@@ -2,6 +2,9 @@
 Integration tests for user API endpoints.
 """
 import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from app.models.user import User
 
 pytestmark = [pytest.mark.integration, pytest.mark.api]
 
@@ -31,24 +34,29 @@ def test_create_user_duplicate_name(client, test_user):
     assert "already exists" in data["detail"]
 
 
-def test_create_user_invalid_data(client):
-    """Test creating user with invalid data."""
-    user_data = {"name": ""}  # Empty name
-    
+@pytest.mark.parametrize(
+    "user_data",
+    [{"name": ""}, {}],
+    ids=["empty_name", "missing_name"],
+)
+def test_create_user_invalid_data(client, user_data):
+    """Test creating user with an empty or missing name."""
     response = client.post("/api/v1/users/", json=user_data)
     
     assert response.status_code == 422  # Validation error
 
 
-def test_create_user_missing_name(client):
-    """Test creating user without name field."""
-    user_data = {}  # Missing name
-    
-    response = client.post("/api/v1/users/", json=user_data)
+def test_create_user_whitespace_name(client):
+    """Test that names are stripped and whitespace-only names are rejected."""
+    response = client.post("/api/v1/users/", json={"name": "  Padded  "})
+    assert response.status_code == 201
+    assert response.json()["name"] == "Padded"
     
-    assert response.status_code == 422  # Validation error
+    response = client.post("/api/v1/users/", json={"name": "   "})
+    assert response.status_code == 422
 
 
+@pytest.mark.max_queries(2)
 def test_get_users_list(client, test_user, second_user):
     """Test getting users list via API."""
     response = client.get("/api/v1/users/")
@@ -75,6 +83,7 @@ def test_get_users_empty_list(client):
     assert data["total"] == 0
 
 
+@pytest.mark.max_queries(1)
 def test_get_user_by_id(client, test_user):
     """Test getting single user by ID via API."""
     response = client.get(f"/api/v1/users/{test_user.id}")
@@ -87,9 +96,25 @@ def test_get_user_by_id(client, test_user):
     assert "updated_at" in data
 
 
-def test_get_user_by_id_not_found(client):
-    """Test getting non-existent user via API."""
-    response = client.get("/api/v1/users/non-existent-id")
+def test_get_user_etag(client, test_user):
+    """Test conditional GET returns 304 for an unchanged user."""
+    response = client.get(f"/api/v1/users/{test_user.id}")
+    etag = response.headers["etag"]
+    
+    response = client.get(f"/api/v1/users/{test_user.id}", headers={"If-None-Match": etag})
+    
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize(
+    "method,json",
+    [("GET", None), ("PUT", {"name": "Non-existent User"}), ("DELETE", None)],
+    ids=["get", "update", "delete"],
+)
+def test_user_not_found(client, method, json):
+    """Test getting, updating and deleting a non-existent user via API."""
+    response = client.request(method, "/api/v1/users/non-existent-id", json=json)
     
     assert response.status_code == 404
     data = response.json()
@@ -108,17 +133,6 @@ def test_update_user_success(client, test_user):
     assert data["id"] == test_user.id
 
 
-def test_update_user_not_found(client):
-    """Test updating non-existent user via API."""
-    update_data = {"name": "Non-existent User"}
-    
-    response = client.put("/api/v1/users/non-existent-id", json=update_data)
-    
-    assert response.status_code == 404
-    data = response.json()
-    assert data["detail"] == "User not found"
-
-
 def test_update_user_duplicate_name(client, test_user, second_user):
     """Test updating user to duplicate name via API."""
     update_data = {"name": second_user.name}
@@ -152,15 +166,6 @@ def test_delete_user_success(client, test_user):
     assert get_response.status_code == 404
 
 
-def test_delete_user_not_found(client):
-    """Test deleting non-existent user via API."""
-    response = client.delete("/api/v1/users/non-existent-id")
-    
-    assert response.status_code == 404
-    data = response.json()
-    assert data["detail"] == "User not found"
-
-
 def test_delete_user_with_flashcards(client, test_user, test_flashcard):
     """Test deleting user with flashcards via API."""
     user_id = test_user.id
@@ -184,51 +189,38 @@ def test_delete_user_with_flashcards(client, test_user, test_flashcard):
 
 
 def test_user_workflow_integration(client):
-    """Test complete user workflow: create, get, update, delete."""
+    """Test complete user workflow: create, update, delete."""
     # Step 1: Create a user
     create_data = {"name": "Workflow Test User"}
     create_response = client.post("/api/v1/users/", json=create_data)
     assert create_response.status_code == 201
     user_data = create_response.json()
+    assert user_data["name"] == "Workflow Test User"
     user_id = user_data["id"]
     
-    # Step 2: Get the user
-    get_response = client.get(f"/api/v1/users/{user_id}")
-    assert get_response.status_code == 200
-    get_data = get_response.json()
-    assert get_data["name"] == "Workflow Test User"
-    
-    # Step 3: Update the user
+    # Step 2: Update the user; the response already carries the stored name
     update_data = {"name": "Updated Workflow User"}
     update_response = client.put(f"/api/v1/users/{user_id}", json=update_data)
     assert update_response.status_code == 200
     update_result = update_response.json()
     assert update_result["name"] == "Updated Workflow User"
     
-    # Step 4: Verify the update
-    verify_response = client.get(f"/api/v1/users/{user_id}")
-    assert verify_response.status_code == 200
-    verify_data = verify_response.json()
-    assert verify_data["name"] == "Updated Workflow User"
-    
-    # Step 5: Delete the user
+    # Step 3: Delete the user
     delete_response = client.delete(f"/api/v1/users/{user_id}")
     assert delete_response.status_code == 200
     
-    # Step 6: Verify deletion
+    # Step 4: Verify deletion
     final_get_response = client.get(f"/api/v1/users/{user_id}")
     assert final_get_response.status_code == 404
 
 
-def test_user_max_limit_enforcement(client):
+def test_user_max_limit_enforcement(client, db_session):
     """Test that user creation respects the maximum limit via API."""
-    # Create 5 users
-    user_ids = []
-    for i in range(5):
-        user_data = {"name": f"Limit Test User {i}"}
-        response = client.post("/api/v1/users/", json=user_data)
-        assert response.status_code == 201
-        user_ids.append(response.json()["id"])
+    # Seed the 5 allowed users directly; only the boundary request matters here
+    db_session.execute(
+        insert(User), [{"name": f"Limit Test User {i}"} for i in range(5)]
+    )
+    db_session.commit()
     
     # Try to create the 6th user (should fail)
     user_data = {"name": "Sixth User"}
@@ -236,26 +228,21 @@ def test_user_max_limit_enforcement(client):
     assert response.status_code == 400
     data = response.json()
     assert "Maximum number of users" in data["detail"]
-    
-    # Clean up
-    for user_id in user_ids:
-        client.delete(f"/api/v1/users/{user_id}")
 
 
-def test_users_list_ordering(client):
+# The seeding INSERT plus the two list queries
+@pytest.mark.max_queries(3)
+def test_users_list_ordering(client, db_session):
     """Test that users list is ordered by creation time."""
-    # Create users in specific order
-    users_data = [
-        {"name": "First User"},
-        {"name": "Second User"},
-        {"name": "Third User"}
-    ]
-    
-    created_users = []
-    for user_data in users_data:
-        response = client.post("/api/v1/users/", json=user_data)
-        assert response.status_code == 201
-        created_users.append(response.json())
+    # Seed users with explicit creation times, inserted out of order so the
+    # result cannot come from insertion order
+    t0 = datetime(2024, 1, 1)
+    db_session.execute(insert(User), [
+        {"name": "Third User", "created_at": t0 + timedelta(seconds=2)},
+        {"name": "First User", "created_at": t0},
+        {"name": "Second User", "created_at": t0 + timedelta(seconds=1)},
+    ])
+    db_session.commit()
     
     # Get users list
     response = client.get("/api/v1/users/")
@@ -267,7 +254,3 @@ def test_users_list_ordering(client):
     assert data["users"][0]["name"] == "First User"
     assert data["users"][1]["name"] == "Second User"
     assert data["users"][2]["name"] == "Third User"
-    
-    # Clean up
-    for user in created_users:
-        client.delete(f"/api/v1/users/{user['id']}")
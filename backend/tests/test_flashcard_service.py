@@ -3,6 +3,7 @@ Unit tests for flashcard service.
 """
 import pytest
 from datetime import datetime, timedelta
+from sqlalchemy import insert
 from app.services.flashcard_service import FlashcardService
 from app.schemas.flashcard import FlashcardCreate, FlashcardUpdate
 from app.models.flashcard import Flashcard
@@ -68,6 +69,66 @@ def test_create_flashcard_different_users_same_word(db_session, test_user, secon
     assert flashcard1.definition != flashcard2.definition
 
 
+def test_bulk_create_flashcards(db_session, test_user, second_user):
+    """Test creating several flashcards in one batch."""
+    flashcards_data = [
+        FlashcardCreate(word="alpha", definition="First letter", user_id=test_user.id),
+        FlashcardCreate(word="beta", definition="Second letter", user_id=test_user.id),
+        FlashcardCreate(word="alpha", definition="First letter", user_id=second_user.id),
+    ]
+    
+    created = FlashcardService.bulk_create_flashcards(db_session, flashcards_data)
+    
+    assert [card.word for card in created] == ["alpha", "beta", "alpha"]
+    assert all(card.bin_number == 0 and card.incorrect_count == 0 for card in created)
+    assert FlashcardService.count_flashcards(db_session, test_user.id) == 2
+    assert FlashcardService.count_flashcards(db_session, second_user.id) == 1
+
+
+def test_bulk_create_flashcards_existing_word(db_session, test_user, test_flashcard):
+    """Test a batch containing an existing word is rejected as a whole."""
+    flashcards_data = [
+        FlashcardCreate(word="fresh", definition="New word", user_id=test_user.id),
+        FlashcardCreate(word=test_flashcard.word, definition="Again", user_id=test_user.id),
+    ]
+    
+    with pytest.raises(ValueError) as exc_info:
+        FlashcardService.bulk_create_flashcards(db_session, flashcards_data)
+    
+    assert "already exists" in str(exc_info.value)
+    assert FlashcardService.count_flashcards(db_session, test_user.id) == 1
+
+
+def test_bulk_create_flashcards_skip_existing(db_session, test_user, test_flashcard):
+    """Test existing and repeated words are skipped when requested."""
+    flashcards_data = [
+        FlashcardCreate(word="fresh", definition="New word", user_id=test_user.id),
+        FlashcardCreate(word=test_flashcard.word, definition="Again", user_id=test_user.id),
+        FlashcardCreate(word="fresh", definition="Repeated", user_id=test_user.id),
+    ]
+    
+    created = FlashcardService.bulk_create_flashcards(
+        db_session, flashcards_data, skip_existing=True
+    )
+    
+    assert [card.word for card in created] == ["fresh"]
+    assert FlashcardService.count_flashcards(db_session, test_user.id) == 2
+
+
+def test_bulk_create_flashcards_limit(db_session, test_user, monkeypatch):
+    """Test a batch that would exceed the per-user limit is rejected."""
+    monkeypatch.setattr(settings, "MAX_FLASHCARDS_PER_USER", 1)
+    flashcards_data = [
+        FlashcardCreate(word="one", definition="1", user_id=test_user.id),
+        FlashcardCreate(word="two", definition="2", user_id=test_user.id),
+    ]
+    
+    with pytest.raises(ValueError) as exc_info:
+        FlashcardService.bulk_create_flashcards(db_session, flashcards_data)
+    
+    assert "maximum limit" in str(exc_info.value)
+
+
 def test_get_flashcard_by_id(db_session, test_flashcard):
     """Test getting flashcard by ID."""
     found_flashcard = FlashcardService.get_flashcard_by_id(db_session, test_flashcard.id)
@@ -123,6 +184,52 @@ def test_get_all_flashcards_pagination(db_session, multiple_flashcards, test_use
     assert page1_ids.isdisjoint(page2_ids)
 
 
+def test_get_flashcards_page_with_total(db_session, multiple_flashcards, test_user):
+    """Test a page comes back with the user's total in the same query."""
+    page, total = FlashcardService.get_flashcards_page(
+        db_session, test_user.id, skip=2, limit=2
+    )
+    assert len(page) == 2
+    assert total == len(multiple_flashcards)
+    
+    # Past the last page the total still reflects every flashcard
+    page, total = FlashcardService.get_flashcards_page(
+        db_session, test_user.id, skip=10, limit=2
+    )
+    assert page == []
+    assert total == len(multiple_flashcards)
+
+
+def test_get_flashcards_after_cursor(db_session, multiple_flashcards, test_user):
+    """Test keyset pagination walks every flashcard exactly once."""
+    page1, cursor, has_more = FlashcardService.get_flashcards_after_cursor(
+        db_session, test_user.id, limit=3
+    )
+    assert len(page1) == 3
+    assert has_more is True
+    assert cursor is not None
+    
+    page2, cursor, has_more = FlashcardService.get_flashcards_after_cursor(
+        db_session, test_user.id, limit=3, cursor=cursor
+    )
+    assert len(page2) == 2
+    assert has_more is False
+    assert cursor is None
+    
+    seen_ids = [card.id for card in page1 + page2]
+    assert sorted(seen_ids) == sorted(card.id for card in multiple_flashcards)
+
+
+def test_get_flashcards_after_cursor_invalid(db_session, test_user):
+    """Test that a malformed cursor is rejected."""
+    with pytest.raises(ValueError) as exc_info:
+        FlashcardService.get_flashcards_after_cursor(
+            db_session, test_user.id, cursor="not-a-cursor"
+        )
+    
+    assert "Invalid pagination cursor" in str(exc_info.value)
+
+
 def test_get_all_flashcards_exclude_hard(db_session, test_user):
     """Test excluding hard to remember cards."""
     # Create a mix of regular and hard cards
@@ -164,6 +271,8 @@ def test_count_flashcards(db_session, multiple_flashcards, test_user):
 
 def test_update_flashcard_success(db_session, test_flashcard):
     """Test successful flashcard update."""
+    # The service's commit expires test_flashcard, so read the original first
+    original_updated_at = test_flashcard.updated_at
     update_data = FlashcardUpdate(
         word="updated_word",
         definition="Updated definition"
@@ -176,7 +285,7 @@ def test_update_flashcard_success(db_session, test_flashcard):
     assert updated_flashcard is not None
     assert updated_flashcard.word == "updated_word"
     assert updated_flashcard.definition == "Updated definition"
-    assert updated_flashcard.updated_at > test_flashcard.updated_at
+    assert updated_flashcard.updated_at > original_updated_at
 
 
 def test_update_flashcard_partial(db_session, test_flashcard):
@@ -229,6 +338,16 @@ def test_update_flashcard_duplicate_word(db_session, test_user):
     assert "already exists" in str(exc_info.value)
 
 
+def test_update_flashcard_null_word(db_session, test_flashcard):
+    """Test clearing the word fails without reporting a duplicate."""
+    update_data = FlashcardUpdate(word=None)
+    
+    with pytest.raises(ValueError) as exc_info:
+        FlashcardService.update_flashcard(db_session, test_flashcard.id, update_data)
+    
+    assert "already exists" not in str(exc_info.value)
+
+
 def test_delete_flashcard_success(db_session, test_flashcard):
     """Test successful flashcard deletion."""
     flashcard_id = test_flashcard.id
@@ -263,19 +382,31 @@ def test_get_user_flashcard_stats(db_session, test_user, multiple_flashcards):
     assert stats["at_limit"] is False
 
 
+def test_get_user_flashcard_stats_invalidated_on_write(db_session, test_user):
+    """Test cached stats are refreshed after creating and deleting flashcards."""
+    assert FlashcardService.get_user_flashcard_stats(db_session, test_user.id)["current_count"] == 0
+    
+    flashcard = FlashcardService.create_flashcard(
+        db_session,
+        FlashcardCreate(word="cached", definition="kept in memory", user_id=test_user.id)
+    )
+    assert FlashcardService.get_user_flashcard_stats(db_session, test_user.id)["current_count"] == 1
+    
+    FlashcardService.delete_flashcard(db_session, flashcard.id)
+    assert FlashcardService.get_user_flashcard_stats(db_session, test_user.id)["current_count"] == 0
+
+
 def test_flashcard_limit_enforcement(db_session, test_user, monkeypatch):
     """Test that flashcard creation respects user limits."""
     # Temporarily set a low limit for testing
     monkeypatch.setattr(settings, "MAX_FLASHCARDS_PER_USER", 2)
     
-    # Create flashcards up to the limit
-    for i in range(2):
-        flashcard_data = FlashcardCreate(
-            word=f"word_{i}",
-            definition=f"Definition {i}",
-            user_id=test_user.id
-        )
-        FlashcardService.create_flashcard(db_session, flashcard_data)
+    # Seed flashcards up to the limit directly; only the boundary call matters
+    db_session.execute(insert(Flashcard), [
+        {"word": f"word_{i}", "definition": f"Definition {i}", "user_id": test_user.id}
+        for i in range(2)
+    ])
+    db_session.commit()
     
     # Try to create one more (should fail)
     flashcard_data = FlashcardCreate(
@@ -27,16 +27,12 @@ def test_health_check_endpoint(client):
     assert data["service"] == "flashcard-backend"
 
 
-def test_openapi_docs(client):
-    """Test that OpenAPI docs are accessible."""
-    response = client.get("/docs")
-    assert response.status_code == 200
-
-
-def test_redoc_docs(client):
-    """Test that ReDoc is accessible."""
-    response = client.get("/redoc")
+@pytest.mark.parametrize("path", ["/docs", "/redoc"], ids=["swagger", "redoc"])
+def test_docs_pages(client, path):
+    """Test that the Swagger UI and ReDoc pages are accessible."""
+    response = client.get(path)
     assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/html")
 
 
 def test_openapi_json(client):
@@ -46,3 +42,26 @@ def test_openapi_json(client):
     data = response.json()
     assert "openapi" in data
     assert "info" in data
+
+
+def test_openapi_json_is_cached(client):
+    """Test that repeated schema requests return identical cached bytes."""
+    first = client.get("/api/v1/openapi.json")
+    second = client.get("/api/v1/openapi.json")
+    assert first.content == second.content
+    assert client.app.state.openapi_bytes == first.content
+    assert "/api/v1/flashcards/" in first.json()["paths"]
+
+
+def test_large_responses_are_gzipped(client):
+    """Test that responses above the size threshold are compressed."""
+    response = client.get("/api/v1/openapi.json", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+
+
+def test_small_responses_are_not_gzipped(client):
+    """Test that small responses are sent uncompressed."""
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
@@ -3,8 +3,11 @@ Unit tests for flashcard models.
 """
 import pytest
 from datetime import datetime
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 from app.models.flashcard import Flashcard
 from app.models.user import User
+from app.models.types import UUIDString
 
 pytestmark = pytest.mark.unit
 
@@ -88,15 +91,21 @@ def test_user_flashcard_relationship(db_session, test_user):
     
     db_session.add_all([flashcard1, flashcard2])
     db_session.commit()
-    db_session.refresh(test_user)
+    
+    # Load the user with its collection (and each card's owner) eagerly
+    user = db_session.scalars(
+        select(User)
+        .where(User.id == test_user.id)
+        .options(selectinload(User.flashcards).selectinload(Flashcard.user))
+    ).one()
     
     # Test the relationship
-    assert len(test_user.flashcards) == 2
-    assert flashcard1 in test_user.flashcards
-    assert flashcard2 in test_user.flashcards
+    assert len(user.flashcards) == 2
+    assert flashcard1 in user.flashcards
+    assert flashcard2 in user.flashcards
     
     # Test reverse relationship
-    assert flashcard1.user == test_user
+    assert flashcard1.user == user
     assert flashcard2.user == test_user
 
 
@@ -146,3 +155,32 @@ def test_flashcard_defaults(db_session, test_user):
     assert flashcard.next_review is not None
     assert flashcard.created_at is not None
     assert flashcard.updated_at is not None
+
+
+def test_uuid_string_binds_on_postgresql():
+    """Test that IDs map to native UUIDs on PostgreSQL and stay strings elsewhere."""
+    from sqlalchemy.dialects import postgresql, sqlite
+    
+    pg = postgresql.dialect()
+    uuid_type = UUIDString()
+    value = "6F9619FF-8B86-D011-B42D-00C04FC964FF"
+    
+    assert isinstance(uuid_type.load_dialect_impl(pg), postgresql.UUID)
+    assert uuid_type.process_bind_param(value, pg) == value.lower()
+    # Malformed IDs can never match, so they bind as NULL instead of erroring
+    assert uuid_type.process_bind_param("non-existent-id", pg) is None
+    assert uuid_type.process_bind_param("non-existent-id", sqlite.dialect()) == "non-existent-id"
+
+
+def test_ready_index_predicate_matches_study_filter(db_session):
+    """Test that the ready-card index repeats the study queries' filter and is PostgreSQL-only."""
+    from sqlalchemy import inspect
+    
+    index = next(i for i in Flashcard.__table__.indexes if i.name == "ix_fc_ready")
+    
+    # PostgreSQL only proves implication for terms written like the query's
+    assert str(index.dialect_options["postgresql"]["where"]) == (
+        "is_hard_to_remember = false AND bin_number >= 1 AND bin_number < 11"
+    )
+    indexes = inspect(db_session.connection()).get_indexes("flashcards")
+    assert "ix_fc_ready" not in {i["name"] for i in indexes}
@@ -3,14 +3,22 @@ Unit tests for study service.
 """
 import pytest
 from datetime import datetime, timedelta
-from app.services.study_service import StudyService
+from types import SimpleNamespace
+from app.core import cache
+from app.services import study_service
+from app.services.study_service import (
+    StudyService,
+    _BIN_DELTAS,
+    _NEXT_CARD_STMT,
+    _STUDY_COUNTS_STMT,
+)
 from app.models.flashcard import Flashcard
-from app.schemas.study import StudyStatusResponse
+from app.schemas.study import StudySessionStats, StudyStatusResponse
 
 pytestmark = pytest.mark.unit
 
 
-def test_get_next_card_for_review_new_card(db_session, test_user):
+def test_get_next_card_for_review_new_card(db_session, test_user, query_count):
     """Test getting next card when only new cards are available."""
     # Create a new card (bin 0)
     new_card = Flashcard(
@@ -20,9 +28,11 @@ def test_get_next_card_for_review_new_card(db_session, test_user):
         bin_number=0
     )
     db_session.add(new_card)
-    db_session.commit()
+    db_session.flush()
     
-    next_card = StudyService.get_next_card_for_review(db_session, test_user.id)
+    with query_count() as queries:
+        next_card = StudyService.get_next_card_for_review(db_session, test_user.id)
+    assert queries.count == 1
     
     assert next_card is not None
     assert next_card.id == new_card.id
@@ -57,7 +67,7 @@ def test_get_next_card_for_review_ready_card(db_session, test_user):
     )
     
     db_session.add_all([ready_card, future_card, new_card])
-    db_session.commit()
+    db_session.flush()
     
     next_card = StudyService.get_next_card_for_review(db_session, test_user.id)
     
@@ -89,7 +99,7 @@ def test_get_next_card_for_review_priority_order(db_session, test_user):
     )
     
     db_session.add_all([bin2_card, bin5_card])
-    db_session.commit()
+    db_session.flush()
     
     next_card = StudyService.get_next_card_for_review(db_session, test_user.id)
     
@@ -117,7 +127,7 @@ def test_get_next_card_for_review_skip_hard_cards(db_session, test_user):
     )
     
     db_session.add_all([hard_card, normal_card])
-    db_session.commit()
+    db_session.flush()
     
     next_card = StudyService.get_next_card_for_review(db_session, test_user.id)
     
@@ -143,7 +153,7 @@ def test_get_next_card_for_review_skip_completed_cards(db_session, test_user):
     )
     
     db_session.add_all([completed_card, active_card])
-    db_session.commit()
+    db_session.flush()
     
     next_card = StudyService.get_next_card_for_review(db_session, test_user.id)
     
@@ -158,68 +168,36 @@ def test_get_next_card_for_review_no_cards(db_session, test_user):
     assert next_card is None
 
 
-def test_update_card_after_review_correct_answer(db_session, test_user):
-    """Test updating card after correct answer."""
-    card = Flashcard(
-        word="test_word",
-        definition="Test definition",
-        user_id=test_user.id,
-        bin_number=2
-    )
-    db_session.add(card)
-    db_session.commit()
-    
-    original_bin = card.bin_number
-    updated_card = StudyService.update_card_after_review(db_session, card.id, correct=True)
-    
-    assert updated_card is not None
-    assert updated_card.bin_number == original_bin + 1
-    assert updated_card.next_review > datetime.utcnow()
-
-
-def test_update_card_after_review_incorrect_answer(db_session, test_user):
-    """Test updating card after incorrect answer."""
+@pytest.mark.parametrize(
+    "start_bin,correct,expected_bin",
+    [(2, True, 3), (10, True, 11), (5, False, 1), (0, False, 0)],
+    ids=["promoted", "completed", "demoted", "stays_new"],
+)
+def test_update_card_after_review_moves_bin(db_session, test_user, start_bin, correct, expected_bin):
+    """Test the bin transition and rescheduling after a review."""
     card = Flashcard(
         word="test_word",
         definition="Test definition",
         user_id=test_user.id,
-        bin_number=5,
+        bin_number=start_bin,
         incorrect_count=2
     )
     db_session.add(card)
-    db_session.commit()
+    db_session.flush()
     
-    updated_card = StudyService.update_card_after_review(db_session, card.id, correct=False)
+    before = datetime.utcnow()
+    updated_card = StudyService.update_card_after_review(db_session, card.id, correct=correct)
+    after = datetime.utcnow()
     
     assert updated_card is not None
-    assert updated_card.bin_number == 1  # Demoted to bin 1
-    assert updated_card.incorrect_count == 3
+    assert updated_card.bin_number == expected_bin
+    assert updated_card.incorrect_count == (2 if correct else 3)
+    delay = _BIN_DELTAS[expected_bin]
+    assert before + delay <= updated_card.next_review <= after + delay
 
 
-def test_update_card_after_review_incorrect_from_bin_zero(db_session, test_user):
-    """Test updating card from bin 0 after incorrect answer."""
-    card = Flashcard(
-        word="test_word",
-        definition="Test definition",
-        user_id=test_user.id,
-        bin_number=0,
-        incorrect_count=0
-    )
-    db_session.add(card)
-    db_session.commit()
-    
-    updated_card = StudyService.update_card_after_review(db_session, card.id, correct=False)
-    
-    assert updated_card is not None
-    assert updated_card.bin_number == 0  # Stays in bin 0
-    assert updated_card.incorrect_count == 1
-
-
-def test_update_card_after_review_mark_hard(db_session, test_user, monkeypatch):
+def test_update_card_after_review_mark_hard(db_session, test_user):
     """Test marking card as hard to remember after too many errors."""
-    # Set a low threshold for testing
-    monkeypatch.setattr("app.core.config.settings.MAX_INCORRECT_COUNT", 3)
-    
     card = Flashcard(
         word="difficult_word",
         definition="Very difficult",
@@ -228,34 +206,20 @@ def test_update_card_after_review_mark_hard(db_session, test_user, monkeypatch):
         incorrect_count=2  # One away from threshold
     )
     db_session.add(card)
-    db_session.commit()
+    db_session.flush()
     
-    updated_card = StudyService.update_card_after_review(db_session, card.id, correct=False)
+    # Use a low threshold for testing
+    updated_card = StudyService.update_card_after_review(
+        db_session, card.id, correct=False, max_incorrect=3
+    )
     
     assert updated_card is not None
     assert updated_card.incorrect_count == 3
     assert updated_card.is_hard_to_remember is True
 
 
-def test_update_card_after_review_max_bin(db_session, test_user):
-    """Test that card doesn't go beyond bin 11."""
-    card = Flashcard(
-        word="mastered_word",
-        definition="Almost mastered",
-        user_id=test_user.id,
-        bin_number=10
-    )
-    db_session.add(card)
-    db_session.commit()
-    
-    updated_card = StudyService.update_card_after_review(db_session, card.id, correct=True)
-    
-    assert updated_card is not None
-    assert updated_card.bin_number == 11  # Max bin
-
-
 def test_update_card_after_review_already_max_bin(db_session, test_user):
-    """Test that card stays at bin 11 when already there."""
+    """Test that a completed card stays at bin 11 and is not rewritten."""
     card = Flashcard(
         word="completed_word",
         definition="Already completed",
@@ -263,12 +227,15 @@ def test_update_card_after_review_already_max_bin(db_session, test_user):
         bin_number=11
     )
     db_session.add(card)
-    db_session.commit()
+    db_session.flush()
     
     updated_card = StudyService.update_card_after_review(db_session, card.id, correct=True)
     
     assert updated_card is not None
     assert updated_card.bin_number == 11  # Stays at max
+    # Nothing changed, so the row was not rewritten
+    assert updated_card.next_review == card.next_review
+    assert updated_card.updated_at == card.updated_at
 
 
 def test_update_card_after_review_not_found(db_session):
@@ -279,23 +246,23 @@ def test_update_card_after_review_not_found(db_session):
 
 def test_calculate_next_review_time():
     """Test next review time calculation."""
+    now = datetime(2024, 1, 1)
+    
     # Test bin 0 (immediate)
-    next_review = StudyService._calculate_next_review_time(0)
-    assert next_review <= datetime.utcnow() + timedelta(seconds=1)
+    assert StudyService._calculate_next_review_time(0, now) == now
     
     # Test bin 1 (5 seconds)
-    next_review = StudyService._calculate_next_review_time(1)
-    expected_min = datetime.utcnow() + timedelta(seconds=4)
-    expected_max = datetime.utcnow() + timedelta(seconds=6)
-    assert expected_min <= next_review <= expected_max
+    assert StudyService._calculate_next_review_time(1, now) == now + timedelta(seconds=5)
+    
+    # Test bin 10 (4 months)
+    assert StudyService._calculate_next_review_time(10, now) == now + timedelta(days=120)
     
     # Test bin 11 (completed - far future)
-    next_review = StudyService._calculate_next_review_time(11)
-    far_future = datetime.utcnow() + timedelta(days=365 * 50)
-    assert next_review > far_future
+    next_review = StudyService._calculate_next_review_time(11, now)
+    assert next_review > now + timedelta(days=365 * 50)
 
 
-def test_get_study_status_with_ready_cards(db_session, test_user):
+def test_get_study_status_with_ready_cards(db_session, test_user, query_count):
     """Test study status when cards are ready for review."""
     now = datetime.utcnow()
     past_time = now - timedelta(minutes=10)
@@ -323,9 +290,12 @@ def test_get_study_status_with_ready_cards(db_session, test_user):
     )
     
     db_session.add_all([ready_card, new_card, future_card, completed_card, hard_card])
-    db_session.commit()
+    db_session.flush()
     
-    status = StudyService.get_study_status(db_session, test_user.id)
+    # Every count comes from a single aggregate query
+    with query_count() as queries:
+        status = StudyService.get_study_status(db_session, test_user.id)
+    assert queries.count == 1
     
     assert isinstance(status, StudyStatusResponse)
     assert status.has_cards is True
@@ -347,7 +317,7 @@ def test_get_study_status_no_ready_cards_but_has_active(db_session, test_user):
         bin_number=3, next_review=future_time
     )
     db_session.add(future_card)
-    db_session.commit()
+    db_session.flush()
     
     status = StudyService.get_study_status(db_session, test_user.id)
     
@@ -370,7 +340,7 @@ def test_get_study_status_no_cards(db_session, test_user):
         bin_number=1, is_hard_to_remember=True
     )
     db_session.add_all([completed_card, hard_card])
-    db_session.commit()
+    db_session.flush()
     
     status = StudyService.get_study_status(db_session, test_user.id)
     
@@ -394,3 +364,131 @@ def test_get_study_status_empty_user(db_session, test_user):
     assert status.completed_cards == 0
     assert status.hard_cards == 0
     assert "permanently done" in status.message
+
+
+def test_get_study_status_cached_until_write(db_session, test_user):
+    """Test that the cached study status is dropped when a card is reviewed."""
+    card = Flashcard(word="cached", definition="Cached status", user_id=test_user.id)
+    db_session.add(card)
+    db_session.flush()
+    
+    assert StudyService.get_study_status(db_session, test_user.id).new_cards_count == 1
+    
+    # A write that bypasses the services is not seen while the entry is valid
+    db_session.add(Flashcard(word="unseen", definition="Added directly", user_id=test_user.id))
+    db_session.flush()
+    assert StudyService.get_study_status(db_session, test_user.id).new_cards_count == 1
+    
+    # Reviewing through the service invalidates the entry
+    StudyService.update_card_after_review(db_session, card.id, True)
+    status = StudyService.get_study_status(db_session, test_user.id)
+    assert status.new_cards_count == 1
+    assert status.total_active_cards == 2
+
+
+def test_get_study_status_not_cached_when_invalidated_during_count(
+    db_session, test_user, monkeypatch, query_count
+):
+    """Test that counts taken before a concurrent write are not cached over it."""
+    execute = db_session.execute
+    
+    def execute_then_invalidate(*args, **kwargs):
+        result = execute(*args, **kwargs)
+        # Another request's write commits between the count and the cache store
+        cache.study_status_cache.delete(test_user.id)
+        return result
+    
+    monkeypatch.setattr(db_session, "execute", execute_then_invalidate)
+    StudyService.get_study_status(db_session, test_user.id)
+    monkeypatch.undo()
+    
+    with query_count() as queries:
+        StudyService.get_study_status(db_session, test_user.id)
+    assert queries.count == 1
+
+
+def test_get_study_session_ignores_cached_status(db_session, test_user):
+    """Test that a stale cached status never hides a card that is ready."""
+    assert StudyService.get_study_status(db_session, test_user.id).has_cards is False
+    
+    # Written without invalidating, as another worker's write would be
+    card = Flashcard(word="fresh", definition="Added elsewhere", user_id=test_user.id)
+    db_session.add(card)
+    db_session.flush()
+    
+    status, next_card = StudyService.get_study_session(db_session, test_user.id)
+    assert status.has_cards is True
+    assert next_card.id == card.id
+
+
+def test_get_study_status_cache_expires_when_card_comes_due(db_session, test_user, monkeypatch):
+    """Test that a cached status never outlives the next scheduled review."""
+    # Drive the service's wall clock and the cache's monotonic clock together
+    clock = {"now": datetime(2024, 1, 1), "monotonic": 1000.0}
+    
+    class FrozenDatetime(datetime):
+        @classmethod
+        def utcnow(cls):
+            return clock["now"]
+    
+    def advance(seconds):
+        clock["now"] += timedelta(seconds=seconds)
+        clock["monotonic"] += seconds
+    
+    monkeypatch.setattr(study_service, "datetime", FrozenDatetime)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: clock["monotonic"]))
+    
+    # Due well inside STUDY_STATUS_CACHE_TTL
+    db_session.add(Flashcard(
+        word="soon", definition="Due shortly", user_id=test_user.id,
+        bin_number=1, next_review=clock["now"] + timedelta(seconds=2)
+    ))
+    db_session.flush()
+    
+    assert StudyService.get_study_status(db_session, test_user.id).has_cards is False
+    
+    advance(3)
+    status = StudyService.get_study_status(db_session, test_user.id)
+    assert status.has_cards is True
+    assert status.ready_cards_count == 1
+
+
+@pytest.mark.parametrize("stmt", [_NEXT_CARD_STMT, _STUDY_COUNTS_STMT], ids=["next_card", "status"])
+def test_study_queries_use_indexes(db_session, test_user, stmt):
+    """Test that the study-loop queries seek an index instead of scanning the table."""
+    connection = db_session.connection()
+    compiled = stmt.compile(dialect=connection.dialect)
+    # Only the plan matters, so placeholder values are good enough
+    params = compiled.construct_params({"user_id": test_user.id, "now": "2024-01-01"})
+    positional = tuple(params[name] for name in compiled.positiontup)
+    
+    plan = [row[3] for row in connection.exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {compiled.string}", positional
+    )]
+    
+    assert not any(step.startswith("SCAN flashcards") for step in plan), plan
+    assert any(step.startswith("SEARCH flashcards USING") for step in plan), plan
+
+
+@pytest.mark.parametrize(
+    "correct,incorrect,expected",
+    [(0, 0, 0.0), (2, 1, 66.67), (1, 31, 3.13), (3, 0, 100.0)],
+)
+def test_accuracy_percentage(correct, incorrect, expected):
+    """Test that accuracy is rounded half up to two decimals."""
+    stats = StudySessionStats(
+        cards_reviewed=correct + incorrect,
+        correct_answers=correct,
+        incorrect_answers=incorrect,
+    )
+    assert stats.accuracy_percentage == expected
+
+
+def test_accuracy_percentage_follows_field_changes():
+    """Test that accuracy is recomputed after a field is reassigned."""
+    stats = StudySessionStats(cards_reviewed=2, correct_answers=1, incorrect_answers=1)
+    assert stats.accuracy_percentage == 50.0
+    
+    stats.correct_answers = 3
+    assert stats.accuracy_percentage == 75.0
+    assert stats == StudySessionStats(cards_reviewed=2, correct_answers=3, incorrect_answers=1)
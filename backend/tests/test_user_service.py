@@ -2,6 +2,8 @@
 Unit tests for user service.
 """
 import pytest
+from sqlalchemy import insert
+from sqlalchemy.exc import InvalidRequestError
 from app.services.user_service import UserService
 from app.schemas.user import UserCreate, UserUpdate
 from app.models.user import User
@@ -9,6 +11,17 @@ from app.models.user import User
 pytestmark = pytest.mark.unit
 
 
+@pytest.fixture
+def many_users(db_session):
+    """Fill every user slot with one bulk INSERT instead of a service call each."""
+    users = db_session.execute(
+        insert(User).returning(User.id, User.name, sort_by_parameter_order=True),
+        [{"name": f"User {i}"} for i in range(1, 6)],
+    ).all()
+    db_session.commit()
+    return users
+
+
 def test_create_user_success(db_session):
     """Test successful user creation."""
     user_data = UserCreate(name="Test User")
@@ -31,13 +44,8 @@ def test_create_user_duplicate_name(db_session, test_user):
     assert "already exists" in str(exc_info.value)
 
 
-def test_create_user_max_limit(db_session, monkeypatch):
+def test_create_user_max_limit(db_session, many_users):
     """Test that user creation respects the maximum limit."""
-    # Create 5 users first
-    for i in range(5):
-        user_data = UserCreate(name=f"User {i}")
-        UserService.create_user(db_session, user_data)
-    
     # Try to create the 6th user
     user_data = UserCreate(name="Sixth User")
     with pytest.raises(ValueError) as exc_info:
@@ -46,27 +54,13 @@ def test_create_user_max_limit(db_session, monkeypatch):
     assert "Maximum number of users" in str(exc_info.value)
 
 
-def test_get_all_users(db_session):
+def test_get_all_users(db_session, many_users):
     """Test getting all users."""
-    # Create multiple users
-    users_data = [
-        UserCreate(name="User 1"),
-        UserCreate(name="User 2"), 
-        UserCreate(name="User 3")
-    ]
-    
-    created_users = []
-    for user_data in users_data:
-        user = UserService.create_user(db_session, user_data)
-        created_users.append(user)
-    
     all_users = UserService.get_all_users(db_session)
     
-    assert len(all_users) == 3
-    user_names = [user.name for user in all_users]
-    assert "User 1" in user_names
-    assert "User 2" in user_names
-    assert "User 3" in user_names
+    assert len(all_users) == len(many_users)
+    user_names = {user.name for user in all_users}
+    assert user_names == {user.name for user in many_users}
 
 
 def test_get_user_by_id(db_session, test_user):
@@ -78,6 +72,15 @@ def test_get_user_by_id(db_session, test_user):
     assert found_user.name == test_user.name
 
 
+def test_get_user_by_id_with_flashcards(db_session, test_user, test_flashcard):
+    """Test that flashcards can be loaded together with the user."""
+    found_user = UserService.get_user_by_id(db_session, test_user.id, load_flashcards=True)
+    db_session.expunge_all()
+    
+    # Already loaded, so reading them needs no session
+    assert [card.id for card in found_user.flashcards] == [test_flashcard.id]
+
+
 def test_get_user_by_id_not_found(db_session):
     """Test getting user by non-existent ID."""
     found_user = UserService.get_user_by_id(db_session, "non-existent-id")
@@ -119,14 +122,12 @@ def test_update_user_not_found(db_session):
     assert result is None
 
 
-def test_update_user_duplicate_name(db_session):
+def test_update_user_duplicate_name(db_session, many_users):
     """Test updating user to duplicate name fails."""
-    # Create two users
-    user1 = UserService.create_user(db_session, UserCreate(name="User 1"))
-    user2 = UserService.create_user(db_session, UserCreate(name="User 2"))
+    user1, user2 = many_users[:2]
     
     # Try to update user2 to have same name as user1
-    update_data = UserUpdate(name="User 1")
+    update_data = UserUpdate(name=user1.name)
     
     with pytest.raises(ValueError) as exc_info:
         UserService.update_user(db_session, user2.id, update_data)
@@ -144,6 +145,15 @@ def test_update_user_same_name(db_session, test_user):
     assert updated_user.name == test_user.name
 
 
+def test_update_user_noop_skips_write(db_session, test_user):
+    """Test that an update without changes leaves the row untouched."""
+    original_updated_at = test_user.updated_at
+    
+    for update_data in (UserUpdate(), UserUpdate(name=test_user.name)):
+        updated_user = UserService.update_user(db_session, test_user.id, update_data)
+        assert updated_user.updated_at == original_updated_at
+
+
 def test_delete_user_success(db_session, test_user):
     """Test successful user deletion."""
     user_id = test_user.id
@@ -163,7 +173,7 @@ def test_delete_user_not_found(db_session):
     assert result is False
 
 
-def test_delete_user_with_flashcards(db_session, test_user, test_flashcard):
+def test_delete_user_with_flashcards(db_session, test_user, test_flashcard, query_count):
     """Test that deleting user also deletes their flashcards."""
     user_id = test_user.id
     flashcard_id = test_flashcard.id
@@ -173,9 +183,11 @@ def test_delete_user_with_flashcards(db_session, test_user, test_flashcard):
     existing_flashcard = FlashcardService.get_flashcard_by_id(db_session, flashcard_id)
     assert existing_flashcard is not None
     
-    # Delete user
-    result = UserService.delete_user(db_session, user_id)
+    # Delete user; the flashcards go in one statement without being loaded
+    with query_count() as queries:
+        result = UserService.delete_user(db_session, user_id)
     assert result is True
+    assert queries.count == 2
     
     # Verify user is deleted
     deleted_user = UserService.get_user_by_id(db_session, user_id)
@@ -186,19 +198,14 @@ def test_delete_user_with_flashcards(db_session, test_user, test_flashcard):
     assert deleted_flashcard is None
 
 
-def test_count_users(db_session):
+def test_count_users_empty(db_session):
+    """Test counting users when there are none."""
+    assert UserService.count_users(db_session) == 0
+
+
+def test_count_users(db_session, many_users):
     """Test counting users."""
-    # Initially should be 0
-    count = UserService.count_users(db_session)
-    assert count == 0
-    
-    # Create users
-    for i in range(3):
-        UserService.create_user(db_session, UserCreate(name=f"User {i}"))
-    
-    # Count should be 3
-    count = UserService.count_users(db_session)
-    assert count == 3
+    assert UserService.count_users(db_session) == len(many_users)
 
 
 def test_count_users_with_existing(db_session, test_user):
@@ -213,3 +220,12 @@ def test_count_users_with_existing(db_session, test_user):
     # Should be 2
     count = UserService.count_users(db_session)
     assert count == 2
+
+
+def test_get_all_users_does_not_lazy_load(db_session, test_user, test_flashcard):
+    """Test that listed users refuse lazy loads instead of querying per user."""
+    db_session.expunge_all()
+    users = UserService.get_all_users(db_session)
+    
+    with pytest.raises(InvalidRequestError):
+        users[0].flashcards
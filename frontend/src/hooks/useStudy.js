@@ -31,24 +31,18 @@ export const useStudy = (selectedUser) => {
     setStatusMessage('');
     
     try {
-      const card = await studyService.getNextCard(selectedUser.id);
-      setCurrentCard(card);
-    } catch (error) {
-      if (error.message?.includes('404') || error.response?.status === 404) {
-        // No cards available, check status
-        try {
-          const status = await studyService.getStudyStatus(selectedUser.id);
-          setStatusMessage(status.message);
-          setHasCards(status.has_cards);
-          setCurrentCard(null);
-        } catch (statusError) {
-          console.error('Error getting study status:', statusError);
-          setStatusMessage(MESSAGES.ERROR_GENERIC);
-        }
+      // Status and next card come back together, so an empty queue needs no second request
+      const { status, next_card: card } = await studyService.getStudySession(selectedUser.id);
+      if (card) {
+        setCurrentCard(card);
       } else {
-        console.error('Error loading next card:', error);
-        setStatusMessage(error.message || MESSAGES.ERROR_GENERIC);
+        setStatusMessage(status.message);
+        setHasCards(status.has_cards);
+        setCurrentCard(null);
       }
+    } catch (error) {
+      console.error('Error loading next card:', error);
+      setStatusMessage(error.message || MESSAGES.ERROR_GENERIC);
     } finally {
       setLoading(false);
     }
@@ -194,6 +194,20 @@ export const studyService = {
       throw error;
     }
   },
+
+  /**
+   * Get study status and the next card for a user in one request
+   * @param {string} userId - The user ID
+   * @returns {Promise<Object>} Study status and next card (null if none)
+   */
+  async getStudySession(userId) {
+    try {
+      const response = await apiClient.get(`/api/v1/study/session?user_id=${userId}`);
+      return response.data;
+    } catch (error) {
+      throw error;
+    }
+  },
 };
 
 /**
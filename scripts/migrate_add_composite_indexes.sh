@@ -0,0 +1,53 @@
+#!/bin/bash
+
+# Database migration script to replace single-column flashcard indexes
+# with composite indexes matching the list and study queries
+
+echo "Migrating flashcard indexes..."
+
+# Check if PostgreSQL is installed
+if ! command -v psql &> /dev/null; then
+    echo "PostgreSQL is not installed. Please install PostgreSQL first."
+    exit 1
+fi
+
+# Default database configuration
+DB_NAME="flashcards"
+
+# Run migration SQL
+sudo -u postgres psql -d $DB_NAME << 'EOF'
+-- Composite indexes (CONCURRENTLY avoids locking writes on live tables)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fc_user_next_review
+    ON flashcards(user_id, next_review, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fc_user_review
+    ON flashcards(user_id, is_hard_to_remember, next_review, id);
+
+-- Study queue: highest ready bin first, stopping at the first match
+CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_fc_user_active_bin_review
+    ON flashcards(user_id, is_hard_to_remember, bin_number DESC, next_review);
+-- Rebuilt on every run: earlier versions used a BETWEEN 1 AND 10 predicate
+-- that the planner cannot match against the study queries' bin filter
+DROP INDEX CONCURRENTLY IF EXISTS ix_fc_ready;
+CREATE INDEX CONCURRENTLY ix_fc_ready
+    ON flashcards(user_id, bin_number DESC, next_review)
+    WHERE is_hard_to_remember = false AND bin_number >= 1 AND bin_number < 11;
+
+-- Single-column indexes now covered by the composites above
+DROP INDEX CONCURRENTLY IF EXISTS idx_flashcards_next_review;
+DROP INDEX CONCURRENTLY IF EXISTS idx_flashcards_is_hard_to_remember;
+DROP INDEX CONCURRENTLY IF EXISTS ix_flashcards_next_review;
+DROP INDEX CONCURRENTLY IF EXISTS ix_flashcards_is_hard_to_remember;
+
+ANALYZE flashcards;
+
+\q
+EOF
+
+if [ $? -eq 0 ]; then
+    echo "✅ Index migration completed successfully!"
+    echo "- Added composite indexes on (user_id, next_review, id) and (user_id, is_hard_to_remember, next_review, id)"
+    echo "- Added study queue indexes ix_fc_user_active_bin_review and partial ix_fc_ready"
+    echo "- Dropped redundant next_review and is_hard_to_remember indexes"
+else
+    echo "❌ Index migration failed. Please check your PostgreSQL setup."
+fi
@@ -0,0 +1,53 @@
+#!/bin/bash
+
+# Database migration script to make deleting a user delete their flashcards
+# through ON DELETE CASCADE on flashcards.user_id. Databases created by the
+# backend's CREATE_TABLES_ON_STARTUP path before this change have the foreign
+# key without it, and create_all never alters an existing constraint.
+# Safe to run more than once.
+
+echo "Migrating flashcards.user_id foreign key to ON DELETE CASCADE..."
+
+# Check if PostgreSQL is installed
+if ! command -v psql &> /dev/null; then
+    echo "PostgreSQL is not installed. Please install PostgreSQL first."
+    exit 1
+fi
+
+# Default database configuration
+DB_NAME="flashcards"
+
+# Run migration SQL
+sudo -u postgres psql -d $DB_NAME -v ON_ERROR_STOP=1 << 'EOF'
+BEGIN;
+
+-- Drop every foreign key from flashcards to users, whatever it was named
+DO $$
+DECLARE
+    fk record;
+BEGIN
+    FOR fk IN
+        SELECT conname FROM pg_constraint
+        WHERE contype = 'f'
+          AND conrelid = 'flashcards'::regclass
+          AND confrelid = 'users'::regclass
+    LOOP
+        EXECUTE format('ALTER TABLE flashcards DROP CONSTRAINT %I', fk.conname);
+    END LOOP;
+END $$;
+
+ALTER TABLE flashcards
+    ADD CONSTRAINT flashcards_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+COMMIT;
+
+\q
+EOF
+
+if [ $? -eq 0 ]; then
+    echo "✅ Foreign key migration completed successfully!"
+    echo "- flashcards.user_id now references users(id) ON DELETE CASCADE"
+else
+    echo "❌ Foreign key migration failed. Please check your PostgreSQL setup."
+fi
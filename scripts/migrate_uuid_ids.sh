@@ -0,0 +1,56 @@
+#!/bin/bash
+
+# Database migration script to store user and flashcard IDs as native
+# PostgreSQL UUIDs instead of VARCHAR
+
+echo "Migrating ID columns to UUID..."
+
+# Check if PostgreSQL is installed
+if ! command -v psql &> /dev/null; then
+    echo "PostgreSQL is not installed. Please install PostgreSQL first."
+    exit 1
+fi
+
+# Default database configuration
+DB_NAME="flashcards"
+
+# Run migration SQL
+sudo -u postgres psql -d $DB_NAME -v ON_ERROR_STOP=1 << 'EOF'
+-- gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it before that
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+BEGIN;
+
+-- The foreign key has to be dropped while both sides change type
+ALTER TABLE flashcards DROP CONSTRAINT IF EXISTS flashcards_user_id_fkey;
+
+ALTER TABLE users
+    ALTER COLUMN id DROP DEFAULT,
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid();
+
+ALTER TABLE flashcards
+    ALTER COLUMN id DROP DEFAULT,
+    ALTER COLUMN id TYPE UUID USING id::uuid,
+    ALTER COLUMN id SET DEFAULT gen_random_uuid(),
+    ALTER COLUMN user_id TYPE UUID USING user_id::uuid;
+
+ALTER TABLE flashcards
+    ADD CONSTRAINT flashcards_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE;
+
+COMMIT;
+
+ANALYZE users;
+ANALYZE flashcards;
+
+\q
+EOF
+
+if [ $? -eq 0 ]; then
+    echo "✅ UUID migration completed successfully!"
+    echo "- users.id, flashcards.id and flashcards.user_id are now UUID columns"
+    echo "- Indexes on these columns were rebuilt with the new type"
+else
+    echo "❌ UUID migration failed. Please check your PostgreSQL setup."
+fi
@@ -35,17 +35,20 @@ GRANT ALL PRIVILEGES ON ALL SEQUENCES IN SCHEMA public TO $DB_USER;
 ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON TABLES TO $DB_USER;
 ALTER DEFAULT PRIVILEGES IN SCHEMA public GRANT ALL ON SEQUENCES TO $DB_USER;
 
+-- gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it before that
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
 -- Create initial tables for multiuser support
 CREATE TABLE IF NOT EXISTS users (
-    id VARCHAR PRIMARY KEY DEFAULT gen_random_uuid()::text,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     name VARCHAR(100) NOT NULL UNIQUE,
     created_at TIMESTAMP DEFAULT current_timestamp NOT NULL,
     updated_at TIMESTAMP DEFAULT current_timestamp
 );
 
 CREATE TABLE IF NOT EXISTS flashcards (
-    id VARCHAR PRIMARY KEY DEFAULT gen_random_uuid()::text,
-    user_id VARCHAR NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
     word VARCHAR(255) NOT NULL,
     definition TEXT NOT NULL,
     bin_number INTEGER DEFAULT 0 NOT NULL,
@@ -60,8 +63,10 @@ CREATE TABLE IF NOT EXISTS flashcards (
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_flashcards_user_id ON flashcards(user_id);
 CREATE INDEX IF NOT EXISTS idx_flashcards_bin_number ON flashcards(bin_number);
-CREATE INDEX IF NOT EXISTS idx_flashcards_next_review ON flashcards(next_review);
-CREATE INDEX IF NOT EXISTS idx_flashcards_is_hard_to_remember ON flashcards(is_hard_to_remember);
+CREATE INDEX IF NOT EXISTS ix_fc_user_next_review ON flashcards(user_id, next_review, id);
+CREATE INDEX IF NOT EXISTS ix_fc_user_review ON flashcards(user_id, is_hard_to_remember, next_review, id);
+CREATE INDEX IF NOT EXISTS ix_fc_user_active_bin_review ON flashcards(user_id, is_hard_to_remember, bin_number DESC, next_review);
+CREATE INDEX IF NOT EXISTS ix_fc_ready ON flashcards(user_id, bin_number DESC, next_review) WHERE is_hard_to_remember = false AND bin_number >= 1 AND bin_number < 11;
 
 -- Create trigger function for updating updated_at
 CREATE OR REPLACE FUNCTION update_updated_at()